@@ -1,16 +1,17 @@
-from logging.config import dictConfig
-
 from src.ingestion.domain import RunContext
 from src.ingestion.bundle_layout import BundleLayout
 from src.ingestion.orchestrator import Orchestrator, OrchestrationConfig
 from src.ingestion.ledger_store import IngestionLedgerStore
-from src.core.settings import DUCK_DB_ATTACH_SQL, CONFIG_BASE_DIRECTORY_PATH, DUCKLAKE_STAGING_DIR, LOGGING_CONFIG, RAW_DATA_DIR
+from src.core.logging_setup import configure_logging
+from src.core.settings import DUCK_DB_ATTACH_SQL, CONFIG_BASE_DIRECTORY_PATH, DUCKLAKE_STAGING_DIR, LOGGING_CONFIG, RAW_DATA_DIR, ensure_directories
 from src.ingestion.csv_config import CSVIngestSpec, load_csv_source_configs_from_directory
 from src.ingestion.load_planner import DefaultLoadPlanner
 
-dictConfig(LOGGING_CONFIG)
 
 def main():
+    ensure_directories()
+    configure_logging(LOGGING_CONFIG)
+
     csv_ingestion_specs: list[CSVIngestSpec] = load_csv_source_configs_from_directory(str(CONFIG_BASE_DIRECTORY_PATH))
     ingestion_ledger_store = IngestionLedgerStore(duckdb_path=":memory:", ducklake_attach_sql=DUCK_DB_ATTACH_SQL)
     orchestrator = Orchestrator(
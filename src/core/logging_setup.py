@@ -0,0 +1,44 @@
+import atexit
+import logging
+import os
+import queue
+from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+
+def configure_logging(config: dict[str, Any]) -> QueueListener | None:
+    """
+    Apply `config` with dictConfig, then put the root logger's file handlers behind a queue.
+
+    Logging calls on the hot path become a queue put; a single listener thread does the
+    RotatingFileHandler rollover check (an os.stat per record) and the actual file write.
+    """
+    dictConfig(config)
+
+    root = logging.getLogger()
+    file_handlers = [h for h in root.handlers if isinstance(h, logging.FileHandler)]
+    if not file_handlers:
+        return None
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    for handler in file_handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *file_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # A forked worker inherits the queue handler but not the listener thread, so its
+    # records would never be written. Give forked children the direct file handlers back.
+    if hasattr(os, "register_at_fork"):
+        def _restore_direct_file_handlers() -> None:
+            root.removeHandler(queue_handler)
+            for handler in file_handlers:
+                root.addHandler(handler)
+
+        os.register_at_fork(after_in_child=_restore_direct_file_handlers)
+
+    return listener
@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import Any
 from pathlib import Path
@@ -7,7 +8,8 @@ PROJECT_NAME = "dataphile"
 AT_HOME = os.getenv("USER") == "nathantapsas" or os.getenv("USERNAME") == "nathantapsas"
 
 # Paths
-PROJECT_ROOT_DIR = Path(__file__).parent.parent.parent.resolve()
+# Module __file__ is already absolute, so plain path arithmetic is enough (no realpath syscalls).
+PROJECT_ROOT_DIR = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 PACKAGE_CACHE_DIR = PROJECT_ROOT_DIR / ".cache"
 
@@ -26,9 +28,14 @@ LOG_FOLDER = PROJECT_ROOT_DIR / "logs"
 
 UDF_DIRECTORY = PROJECT_ROOT_DIR / "udfs"
 
-os.makedirs(LOG_FOLDER, exist_ok=True)
-os.makedirs(DUCKLAKE_STORAGE_DIR, exist_ok=True)
-os.makedirs(DUCKLAKE_STAGING_DIR, exist_ok=True)
+
+@functools.cache
+def ensure_directories() -> None:
+    """Create the log/storage/staging folders. Called by entry points, not at import."""
+    os.makedirs(LOG_FOLDER, exist_ok=True)
+    os.makedirs(DUCKLAKE_STORAGE_DIR, exist_ok=True)
+    os.makedirs(DUCKLAKE_STAGING_DIR, exist_ok=True)
+
 # Schemas
 SCHEMA_BRONZE = f"bronze_{PROJECT_NAME}"
 SCHEMA_SILVER = f"silver_{PROJECT_NAME}"
@@ -71,6 +78,7 @@ LOGGING_CONFIG: dict[str, Any] = {
             "maxBytes": 10485760,  # 10MB
             "backupCount": 5,
             "encoding": "utf8",
+            "delay": True,  # open the log file on first record, not when logging is configured
         },
     },
     "loggers": {
@@ -1,20 +1,37 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-import hashlib
-import json
+import errno
 import os
 import shutil
+import threading
 import time
 import uuid
 import logging
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
+
+import orjson
 
 from src.ingestion.domain import FileKey
 
 logger = logging.getLogger(__name__)
 
+_trash_deleter: ThreadPoolExecutor | None = None
+_trash_deleter_lock = threading.Lock()
+
+_warned_cross_device = False
+
+
+def _get_trash_deleter() -> ThreadPoolExecutor:
+    """Single background thread that deletes detached trash dirs (joined at interpreter exit)."""
+    global _trash_deleter
+    with _trash_deleter_lock:
+        if _trash_deleter is None:
+            _trash_deleter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bundle-trash")
+        return _trash_deleter
+
 
 @dataclass(frozen=True)
 class BundleLayout:
@@ -24,6 +41,7 @@ class BundleLayout:
       staging_root/
         _tmp/    -> Working area for active extractions
         _trash/  -> Atomic deletion holding area (Trash Pattern)
+        _legacy_bundle_ids_migrated -> Marker: MD5-named bundles have been adopted (see migrate_legacy_bundle_dirs)
         <source_name>/
           <bundle_hash>_<spec_prefix>/ -> Completed bundles waiting for load
     """
@@ -31,6 +49,7 @@ class BundleLayout:
     staging_root: Path
     tmp_dirname: str = "_tmp"
     trash_dirname: str = "_trash"
+    legacy_migration_marker_name: str = "_legacy_bundle_ids_migrated"
 
     # ----------------------------
     # Paths
@@ -43,15 +62,18 @@ class BundleLayout:
     def trash_root(self) -> Path:
         return self.staging_root / self.trash_dirname
 
+    @property
+    def legacy_migration_marker_path(self) -> Path:
+        return self.staging_root / self.legacy_migration_marker_name
+
     def get_bundle_directory_for(self, key: FileKey) -> Path:
-        bundle_id = hashlib.md5(key.raw_file_metadata_signature.encode("utf-8")).hexdigest()[:16]
-        spec_prefix = key.spec_hash[:12]
-        return self.staging_root / key.source_name / f"{bundle_id}_{spec_prefix}"
+        return self.staging_root / key.source_name / f"{key.bundle_id}_{key.spec_prefix}"
+
+    def get_legacy_bundle_directory_for(self, key: FileKey) -> Path:
+        return self.staging_root / key.source_name / f"{key.legacy_bundle_id}_{key.spec_prefix}"
 
     def get_tmp_bundle_directory_for(self, key: FileKey, *, claim_token: str) -> Path:
-        bundle_id = hashlib.md5(key.raw_file_metadata_signature.encode("utf-8")).hexdigest()[:16]
-        spec_prefix = key.spec_hash[:12]
-        return self.tmp_root / key.source_name / claim_token / f"{bundle_id}_{spec_prefix}"
+        return self.tmp_root / key.source_name / claim_token / f"{key.bundle_id}_{key.spec_prefix}"
 
     def get_bundle_manifest_path(self, bundle_dir: Path) -> Path:
         return bundle_dir / "bundle.json"
@@ -62,13 +84,24 @@ class BundleLayout:
     def ensure_bundle_directory(self, bundle_dir: Path) -> None:
         bundle_dir.mkdir(parents=True, exist_ok=True)
 
-    def write_bundle_manifest(self, bundle_dir: Path, payload: dict[str, Any]) -> None:
-        """Writes bundle.json atomically: tmp -> rename."""
-        self.ensure_bundle_directory(bundle_dir)
+    def write_bundle_manifest(self, bundle_dir: Path, payload: dict[str, Any], *, atomic: bool = True) -> None:
+        """
+        Writes bundle.json. With atomic=True (default): tmp -> rename.
+
+        atomic=False writes in place. Only use it when readers cannot see bundle_dir yet,
+        e.g. a tmp bundle that is promoted atomically afterwards.
+        """
         manifest_path = self.get_bundle_manifest_path(bundle_dir)
-        tmp_path = manifest_path.with_suffix(".json.tmp")
-        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
-        os.replace(tmp_path, manifest_path)
+        target_path = manifest_path.with_suffix(".json.tmp") if atomic else manifest_path
+        content = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        try:
+            target_path.write_bytes(content)
+        except FileNotFoundError:
+            # The extraction worker normally created bundle_dir already; only mkdir when it didn't.
+            self.ensure_bundle_directory(bundle_dir)
+            target_path.write_bytes(content)
+        if atomic:
+            os.replace(target_path, manifest_path)
 
     def is_complete_bundle_dir(self, bundle_dir: Path) -> bool:
         return self.get_bundle_manifest_path(bundle_dir).exists()
@@ -80,16 +113,24 @@ class BundleLayout:
         """
         self.ensure_bundle_directory(final_bundle_dir.parent)
 
+        # 0) Fast path: a first-time promotion needs no existence probe. A non-replacing
+        #    rename fails if the final dir is already there (or is locked), and only then
+        #    do we fall back to the trash + retry path below.
+        try:
+            os.rename(tmp_bundle_dir, final_bundle_dir)
+        except OSError:
+            pass
+        else:
+            self._prune_empty_parents(tmp_bundle_dir.parent)
+            return
+
         # 1) Trash Pattern: move existing directory out of the way
         if final_bundle_dir.exists():
-            self.ensure_bundle_directory(self.trash_root)
-            trash_path = self.trash_root / f"{final_bundle_dir.name}_{uuid.uuid4().hex}"
-            try:
-                os.rename(final_bundle_dir, trash_path)
-            except OSError:
-                shutil.rmtree(final_bundle_dir, ignore_errors=True)
+            self._move_to_trash(final_bundle_dir)
 
-        # 2) Promotion: move tmp -> final with retries for transient locks
+        # 2) Promotion: move tmp -> final with retries for transient locks.
+        #    AV/sync micro-locks usually clear within milliseconds, so back off
+        #    exponentially from 2ms (capped at 500ms) instead of a linear 50ms step.
         max_retries = 10
         for i in range(max_retries):
             try:
@@ -101,7 +142,84 @@ class BundleLayout:
                 logger.warning(f"PermissionError during bundle promotion (attempt {i + 1}/{max_retries}). Retrying...")
                 if i == max_retries - 1:
                     raise
-                time.sleep(0.05 * (i + 1))
+                time.sleep(min(0.5, 0.002 * (2 ** i)))
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                self._promote_across_devices(tmp_bundle_dir=tmp_bundle_dir, final_bundle_dir=final_bundle_dir)
+                self._prune_empty_parents(tmp_bundle_dir.parent)
+                return
+
+    def _promote_across_devices(self, *, tmp_bundle_dir: Path, final_bundle_dir: Path) -> None:
+        """
+        _tmp and the final bundle dir are on different filesystems (e.g. a source dir that is a
+        mount point), so rename can't work. Copy next to the final dir, then rename into place,
+        so readers still never see a half-copied bundle.
+
+        The rename attempt itself reports EXDEV, so no st_dev probe is needed per bundle.
+        """
+        global _warned_cross_device
+        if not _warned_cross_device:
+            _warned_cross_device = True
+            logger.warning(
+                "Bundle promotion crosses filesystems (%s -> %s); every bundle will be copied instead "
+                "of renamed. Keep %s on the same filesystem as the source directories.",
+                tmp_bundle_dir, final_bundle_dir, self.tmp_root,
+            )
+
+        incoming_dir = final_bundle_dir.with_name(f"{final_bundle_dir.name}.incoming_{uuid.uuid4().hex}")
+        try:
+            shutil.copytree(tmp_bundle_dir, incoming_dir)
+            os.replace(incoming_dir, final_bundle_dir)
+        except BaseException:
+            shutil.rmtree(incoming_dir, ignore_errors=True)
+            raise
+        shutil.rmtree(tmp_bundle_dir, ignore_errors=True)
+
+    def _move_to_trash(self, bundle_dir: Path) -> None:
+        """Move a directory into _trash (emptied by cleanup_trash); rmtree it in place if it can't be renamed."""
+        self.ensure_bundle_directory(self.trash_root)
+        trash_path = self.trash_root / f"{bundle_dir.name}_{uuid.uuid4().hex}"
+        try:
+            os.rename(bundle_dir, trash_path)
+        except OSError:
+            shutil.rmtree(bundle_dir, ignore_errors=True)
+
+    def migrate_legacy_bundle_dirs(self, keys: Iterable[FileKey]) -> int:
+        """
+        One-time adoption of complete bundles written under the old MD5 bundle ids: each is
+        renamed to its xxh3 name, so bundles left behind by an interrupted run are reused instead
+        of re-extracted. A legacy dir whose xxh3 bundle already exists is stale and goes to _trash.
+
+        A clean sweep writes the marker file; later calls return at once, without hashing keys.
+        Returns number of dirs renamed.
+        """
+        marker_path = self.legacy_migration_marker_path
+        if marker_path.exists():
+            return 0
+
+        migrated = 0
+        sweep_complete = True
+        for key in keys:
+            legacy_dir = self.get_legacy_bundle_directory_for(key)
+            if not self.is_complete_bundle_dir(legacy_dir):
+                continue
+            final_dir = self.get_bundle_directory_for(key)
+            if final_dir.exists():
+                self._move_to_trash(legacy_dir)
+                continue
+            try:
+                os.rename(legacy_dir, final_dir)
+                migrated += 1
+            except OSError:
+                # Leave the marker unwritten so the next run retries this dir
+                sweep_complete = False
+                logger.warning("Could not migrate legacy bundle dir %s", legacy_dir)
+
+        if sweep_complete:
+            self.ensure_bundle_directory(self.staging_root)
+            marker_path.touch()
+        return migrated
 
     def delete_bundle_dir(self, bundle_dir: Path) -> None:
         """
@@ -124,15 +242,14 @@ class BundleLayout:
         """
         Walk upward deleting empty dirs until staging_root or a protected dir is reached.
         Returns number of dirs removed.
+
+        rmdir itself refuses missing, non-directory and non-empty paths, so each level
+        costs a single syscall instead of separate exists/is_dir/listdir probes.
         """
         removed = 0
         current = start_dir
 
-        while True:
-            if not current.exists() or not current.is_dir():
-                break
-            if self._is_protected_dir(current):
-                break
+        while not self._is_protected_dir(current):
             # stop if above staging_root
             try:
                 current.relative_to(self.staging_root)
@@ -140,13 +257,11 @@ class BundleLayout:
                 break
 
             try:
-                if any(current.iterdir()):
-                    break
                 current.rmdir()
-                removed += 1
             except OSError:
                 break
 
+            removed += 1
             current = current.parent
 
         return removed
@@ -154,53 +269,75 @@ class BundleLayout:
     # ----------------------------
     # Cleanup / GC
     # ----------------------------
+    @staticmethod
+    def _scandir_dirs(path: Path) -> Iterator[os.DirEntry[str]]:
+        """Yield sub-directory entries of `path`, reusing the cached DirEntry type info."""
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield entry
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return
+
+    @staticmethod
+    def _is_empty_dir(path: Path) -> bool:
+        with os.scandir(path) as it:
+            return next(it, None) is None
+
     def iter_final_bundles(self) -> Iterable[Path]:
-        if not self.staging_root.exists():
-            return []
-        for source_dir in self.staging_root.iterdir():
-            if not source_dir.is_dir():
+        for source_entry in self._scandir_dirs(self.staging_root):
+            if source_entry.name.startswith("_"):
                 continue
-            if source_dir.name.startswith("_"):
-                continue
-            for bundle_dir in source_dir.iterdir():
-                if bundle_dir.is_dir():
-                    yield bundle_dir
+            for bundle_entry in self._scandir_dirs(Path(source_entry.path)):
+                yield Path(bundle_entry.path)
 
     def cleanup_trash(self) -> int:
-        """Empties the _trash folder."""
+        """
+        Empties the _trash folder.
+
+        The whole folder is detached with one rename and deleted on a background thread,
+        so a commit never waits on rmtree of superseded bundles.
+        """
+        try:
+            if self._is_empty_dir(self.trash_root):
+                return 0
+        except OSError:
+            return 0
+
+        detached = self.staging_root / f"{self.trash_dirname}_{uuid.uuid4().hex}"
+        try:
+            os.rename(self.trash_root, detached)
+        except OSError:
+            return self._empty_trash_in_place()
+
+        self.trash_root.mkdir(parents=True, exist_ok=True)
+        _get_trash_deleter().submit(shutil.rmtree, detached, ignore_errors=True)
+        return 1
+
+    def _empty_trash_in_place(self) -> int:
         deleted = 0
-        if self.trash_root.exists():
+        for p in self.trash_root.iterdir():
             try:
-                shutil.rmtree(self.trash_root)
-                self.trash_root.mkdir(parents=True, exist_ok=True)
-                deleted = 1
+                if p.is_dir():
+                    shutil.rmtree(p, ignore_errors=True)
+                else:
+                    p.unlink(missing_ok=True)
+                deleted += 1
             except Exception:
-                for p in self.trash_root.iterdir():
-                    try:
-                        if p.is_dir():
-                            shutil.rmtree(p, ignore_errors=True)
-                        else:
-                            p.unlink(missing_ok=True)
-                        deleted += 1
-                    except Exception:
-                        pass
+                pass
         return deleted
 
     def prune_empty_source_directories(self) -> int:
         """Removes source directories (e.g. staging/account) if they are empty."""
         pruned = 0
-        if not self.staging_root.exists():
-            return 0
-
-        for source_dir in self.staging_root.iterdir():
-            if not source_dir.is_dir():
-                continue
-            if source_dir.name.startswith("_"):
+        for source_entry in self._scandir_dirs(self.staging_root):
+            if source_entry.name.startswith("_"):
                 continue
 
             try:
-                if not any(source_dir.iterdir()):
-                    source_dir.rmdir()
+                if self._is_empty_dir(Path(source_entry.path)):
+                    os.rmdir(source_entry.path)
                     pruned += 1
             except OSError:
                 pass
@@ -212,13 +349,8 @@ class BundleLayout:
         (We do NOT wipe all of _tmp in case something else is running.)
         """
         removed = 0
-        root = self.tmp_root
-        if not root.exists():
-            return 0
-
-        for source_dir in root.iterdir():
-            if not source_dir.is_dir():
-                continue
+        for source_entry in self._scandir_dirs(self.tmp_root):
+            source_dir = Path(source_entry.path)
             run_dir = source_dir / run_id
             if not run_dir.exists():
                 continue
@@ -228,7 +360,7 @@ class BundleLayout:
 
             # If run_dir still exists but is empty, remove it
             try:
-                if run_dir.exists() and not any(run_dir.iterdir()):
+                if self._is_empty_dir(run_dir):
                     run_dir.rmdir()
                     removed += 1
             except OSError:
@@ -253,6 +385,12 @@ class BundleLayout:
             except Exception as e:
                 logger.warning(f"Failed to wipe tmp root: {e}")
 
+        # Detached trash dirs whose background delete never finished (e.g. process killed)
+        for entry in self._scandir_dirs(self.staging_root):
+            if entry.name.startswith(f"{self.trash_dirname}_"):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                deleted += 1
+
         for final_bundle in list(self.iter_final_bundles()):
             if not self.is_complete_bundle_dir(final_bundle):
                 self.delete_bundle_dir(final_bundle)
@@ -2,6 +2,7 @@ import csv
 import logging
 from collections import defaultdict
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Set
 
@@ -23,6 +24,11 @@ class BusinessCalendar:
         elif holiday_file_path:
             logger.warning(f"Holiday file configured but not found at: {holiday_file_path}. Assuming no holidays.")
 
+        # Proleptic ordinals make the hot-path check a modulo + int hash lookup.
+        self._holiday_ordinals: frozenset[int] = frozenset(d.toordinal() for d in self._holidays)
+        # Per-instance memo: discovery asks for the same snapshot dates over and over.
+        self.get_previous_business_day = lru_cache(maxsize=4096)(self.get_previous_business_day)
+
     def _load_holidays(self, path: Path) -> None:
         """
         Parses the vendor CSV. 
@@ -75,15 +81,9 @@ class BusinessCalendar:
             raise
 
     def is_business_day(self, d: date) -> bool:
-        # 1. Check Weekend (5=Sat, 6=Sun)
-        if d.weekday() >= 5:
-            return False
-        
-        # 2. Check Global Holiday
-        if d in self._holidays:
-            return False
-            
-        return True
+        # Ordinal 1 (0001-01-01) is a Monday, so (ordinal + 6) % 7 is the weekday (5=Sat, 6=Sun).
+        ordinal = d.toordinal()
+        return (ordinal + 6) % 7 < 5 and ordinal not in self._holiday_ordinals
 
     def get_previous_business_day(self, reference_date: date) -> date:
         """
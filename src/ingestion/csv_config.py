@@ -1,10 +1,12 @@
 # ETL/etl/csv_config.py
-from glob import glob
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import logging
 from csv import QUOTE_ALL
 import os
 import re
-from typing import Annotated, Literal, Self, Union
+from typing import Annotated, Any, Iterable, Mapping, Literal, Self, TypeVar, Union
 import yaml
 
 
@@ -21,6 +23,13 @@ from core.settings import SYSTEM_COL_SOURCE_FILE, SYSTEM_COL_INGESTED_AT, SYSTEM
 
 logger = logging.getLogger(__name__)
 
+_VALID_COLUMN_NAME_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
  
 TypeCasterSpec = Annotated[
     Union[BooleanCaster, DecimalCaster, DateCaster, IntegerCaster, StringCaster],
@@ -42,6 +51,11 @@ class SourceSpec(StrictBaseModel):
     filename_date_regex: str | None = r"^.*_(\d{6})\d*\.txt$"
     filename_date_format: str | None = "%y%m%d"
 
+    # Let Arrow's CSV reader handle quoting (RFC-4180 style: doubled quotes, quoted newlines).
+    # Only enable for sources known to be well-formed; the default line cleaner tolerates
+    # the stray quotes / broken lines some vendor extracts contain.
+    native_quoting: bool = False
+
     @model_validator(mode="after")
     def validate_spec(self) -> Self:
         if self.quoting == QUOTE_ALL and not self.quote_char:
@@ -52,6 +66,13 @@ class SourceSpec(StrictBaseModel):
 
         return self
 
+    @cached_property
+    def filename_date_pattern(self) -> re.Pattern[str] | None:
+        """Compiled filename_date_regex, built once per spec instead of per discovered file."""
+        if self.filename_date_regex is None:
+            return None
+        return re.compile(self.filename_date_regex)
+
 class ForeignKeySpec(StrictBaseModel):
     local_columns: list[str]
     remote_table: str
@@ -84,12 +105,12 @@ class CSVIngestSpec(StrictBaseModel):
 
     @model_validator(mode="after")
     def validate_spec(self) -> Self:
-        db_column_names = list(self.columns.keys())
-        if duplicates := {name for name in db_column_names if db_column_names.count(name) > 1}:
+        column_name_counts = Counter(self.columns.keys())
+        if duplicates := {name for name, count in column_name_counts.items() if count > 1}:
             raise ValueError(f"Duplicate column names found in column_specs: {duplicates}")
 
         for column_name in self.columns.keys():
-            if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", column_name):
+            if not _VALID_COLUMN_NAME_PATTERN.match(column_name):
                 raise ValueError(f"Invalid column name '{column_name}'. Must start with a letter or underscore, "
                                  "followed by letters, digits, or underscores.")
                                 
@@ -109,42 +130,80 @@ class CSVIngestSpec(StrictBaseModel):
 
         return self
 
-    @property
-    def source_headers(self) -> set[str]:
+    # Specs are read-only once loaded, so derived views are computed on first use and cached.
+    @cached_property
+    def source_headers(self) -> frozenset[str]:
         headers: set[str] = set()
         for spec in self.columns.values():
             if isinstance(spec.csv_header, list):
                 headers.update(spec.csv_header)
             else:
                 headers.add(spec.csv_header)
-        return headers
+        return frozenset(headers)
 
-    def get_schema(self) -> dict[str, str]:
+    @cached_property
+    def _schema(self) -> Mapping[str, str]:
         schema: dict[str, str] = {}
         for db_column_name, column_spec in self.columns.items():
             schema[db_column_name] = column_spec.type_caster.output_type
         return schema
 
+    def get_schema(self) -> Mapping[str, str]:
+        return self._schema
 
-def load_csv_source_configs_from_directory(directory_path: str) -> list[CSVIngestSpec]:
-    file_paths = sorted(glob(os.path.join(directory_path, "*.yaml")))
 
-    configs: dict[str, CSVIngestSpec] = {}
-    for file_path in file_paths:
-        with open(file_path, "r") as file:
-            config_yaml = yaml.safe_load(file)
-            try:
-                config = CSVIngestSpec.model_validate(config_yaml)
+def _load_csv_source_config(file_path: str) -> CSVIngestSpec:
+    with open(file_path, "rb") as file:
+        config_yaml = yaml.load(file.read(), Loader=_YamlLoader)
+    try:
+        return CSVIngestSpec.model_validate(config_yaml)
+    except Exception as e:
+        raise ValueError(f"Error loading CSV source config from {file_path}: {e}")
 
-                if config.name in configs:
-                    raise ValueError(f"Duplicate CSV source config name '{config.name}' found in file: {file_path}")
 
-                configs[config.name] = config
+def _intern_shared_submodels(configs: Iterable[CSVIngestSpec]) -> None:
+    """
+    Make identical type casters / column specs / foreign keys share one instance across all specs.
+    Specs are treated as read-only once validated, so sharing is safe and saves memory.
+    """
+    interned: dict[tuple[type[BaseModel], str], Any] = {}
 
-            except Exception as e:
-                raise ValueError(f"Error loading CSV source config from {file_path}: {e}")
+    def intern(model: _ModelT) -> _ModelT:
+        return interned.setdefault((type(model), model.model_dump_json()), model)
+
+    for config in configs:
+        for column_name, column_spec in config.columns.items():
+            column_spec.type_caster = intern(column_spec.type_caster)
+            config.columns[column_name] = intern(column_spec)
+        config.foreign_keys = [intern(fk_spec) for fk_spec in config.foreign_keys]
+
+
+def load_csv_source_configs_from_directory(directory_path: str) -> list[CSVIngestSpec]:
+    with os.scandir(directory_path) as it:
+        file_paths = sorted(
+            entry.path
+            for entry in it
+            # glob("*.yaml") never matched dotfiles; keep that behaviour
+            if entry.name.endswith(".yaml") and not entry.name.startswith(".") and entry.is_file(follow_symlinks=False)
+        )
+
+    configs: dict[str, CSVIngestSpec] = {}
+    if file_paths:
+        # executor.map preserves input order, so duplicate detection stays deterministic
+        with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as executor:
+            loaded = list(executor.map(_load_csv_source_config, file_paths))
+
+        for file_path, config in zip(file_paths, loaded):
+            if config.name in configs:
+                raise ValueError(
+                    f"Error loading CSV source config from {file_path}: "
+                    f"Duplicate CSV source config name '{config.name}' found in file: {file_path}"
+                )
+            configs[config.name] = config
     
     if not configs:
         logger.warning(f"No CSV source configuration files found in directory: {directory_path}")
 
-    return list(configs.values())
\ No newline at end of file
+    _intern_shared_submodels(configs.values())
+
+    return list(configs.values())
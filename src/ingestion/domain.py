@@ -1,14 +1,29 @@
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+from functools import lru_cache
+import hashlib
+
+import xxhash
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+
+
+@lru_cache(maxsize=None)
+def _bundle_id_for(raw_file_metadata_signature: str) -> str:
+    return xxhash.xxh3_64_hexdigest(raw_file_metadata_signature.encode("utf-8"))
+
+
+def _legacy_bundle_id_for(raw_file_metadata_signature: str) -> str:
+    return hashlib.md5(raw_file_metadata_signature.encode("utf-8")).hexdigest()[:16]
 
 
-@dataclass(frozen=True)
-class FileKey:
+class FileKey(NamedTuple):
     """
     Identity for an ingested raw file under a specific ingestion spec.
 
+    A NamedTuple rather than a dataclass: hashing and equality run in C, which matters
+    for the large completed-keys set the orchestrator probes once per discovered file.
+
     raw_file_metadata_signature:
       A cheap content proxy (often filename + size + mtime). If you want stronger
       guarantees, replace it with a cryptographic digest.
@@ -20,24 +35,43 @@ class FileKey:
     raw_file_metadata_signature: str
     spec_hash: str
 
+    @property
+    def bundle_id(self) -> str:
+        """Short, filesystem-safe tag derived from the metadata signature (memoized per signature)."""
+        return _bundle_id_for(self.raw_file_metadata_signature)
+
+    @property
+    def legacy_bundle_id(self) -> str:
+        """MD5-based bundle tag used before xxh3; only needed to adopt old staging dirs."""
+        return _legacy_bundle_id_for(self.raw_file_metadata_signature)
+
+    @property
+    def spec_prefix(self) -> str:
+        return self.spec_hash[:12]
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class DiscoveredFile:
     """A raw file discovered on disk."""
     file_key: FileKey
     raw_file_path: Path
     raw_file_size_bytes: int
-    raw_file_mtime_utc: datetime  # naive UTC
+    raw_file_mtime_epoch: float  # st_mtime as returned by stat
     data_as_of_date: date | None = None
 
+    @property
+    def raw_file_mtime_utc(self) -> datetime:
+        """Modification time as a naive UTC datetime (built on demand; discovery keeps the float)."""
+        return datetime.fromtimestamp(self.raw_file_mtime_epoch, tz=timezone.utc).replace(tzinfo=None)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunContext:
     """Per-run context."""
     run_id: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExtractionResult:
     """Result returned by an extraction worker."""
     extracted_bundle_path: Path
@@ -45,7 +79,7 @@ class ExtractionResult:
     data_as_of_date: date | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LoadTarget:
     """
     A planned load of one artifact into one target table.
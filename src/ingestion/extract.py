@@ -1,9 +1,8 @@
-import csv
 import io
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Generator, Iterator
 
 import pyarrow as pa
 import pyarrow.csv as pv
@@ -19,59 +18,51 @@ class CSVExtractionError(Exception):
     pass
 
 
-@dataclass(frozen=True)
-class ExtractedRecord:
-    """Legacy dataclass for backward compatibility."""
-    payload: dict[str, Any]
-    source_file: str
-    line_number: int
-    raw_header: str
-    errors: list[dict[str, str | None]]
-
-
-class GeneratorStream(io.RawIOBase):
+class CleanedBlockStream(io.RawIOBase):
     """
-    Adapts a Python generator yielding bytes into a file-like object 
-    that PyArrow's C++ engine can read from natively.
+    Read-only file over the cleaner's block iterator, so Arrow pulls cleaned bytes as it
+    parses and only the current block is resident, not the whole cleaned file.
     """
-    def __init__(self, generator: Generator[bytes, None, None]):
-        self._gen = generator
-        self._leftover = b""
-        self._iterator_finished = False
+    def __init__(self, blocks: Iterator[bytes]):
+        self._blocks = blocks
+        self._current = memoryview(b"")
 
     def readable(self) -> bool:
         return True
 
-    def readinto(self, b: bytearray) -> int | None:
-        size = len(b)
-        if size == 0:
-            return 0
+    def readinto(self, b: Any) -> int:
+        out = memoryview(b).cast("B")
+        filled = 0
+        while filled < len(out):
+            if not self._current:
+                block = next(self._blocks, None)
+                if block is None:
+                    break
+                self._current = memoryview(block)
+                continue
+            n = min(len(out) - filled, len(self._current))
+            out[filled:filled + n] = self._current[:n]
+            self._current = self._current[n:]
+            filled += n
+        return filled
 
-        data_len = len(self._leftover)
-        chunks = [self._leftover]
-        
-        while data_len < size and not self._iterator_finished:
-            try:
-                chunk = next(self._gen)
-                data_len += len(chunk)
-                chunks.append(chunk)
-            except StopIteration:
-                self._iterator_finished = True
 
-        if data_len == 0:
-            return 0
-
-        all_data = b"".join(chunks)
-        count = min(data_len, size)
-        b[:count] = all_data[:count]
-        self._leftover = all_data[count:]
-
-        return count
+@dataclass(frozen=True)
+class ExtractedRecord:
+    """Legacy dataclass for backward compatibility."""
+    payload: dict[str, Any]
+    source_file: str
+    line_number: int
+    raw_header: str
+    errors: list[dict[str, str | None]]
 
 
 class FastCSVExtractor:
     INTERNAL_DELIMITER_BYTE = b'\x1f'
     INTERNAL_DELIMITER_STR = '\x1f'
+    CLEAN_BLOCK_SIZE_BYTES = 1 << 20
+    CLEAN_SUBBLOCK_SIZE_BYTES = 1 << 16
+    READ_BLOCK_SIZE_BYTES = 1 << 24
 
     def __init__(self, csv_ingest_spec: CSVIngestSpec) -> None:
         self.spec = csv_ingest_spec
@@ -84,19 +75,28 @@ class FastCSVExtractor:
             for candidate in candidates:
                 self._header_map[candidate] = db_col_name
 
-    def _get_clean_header(self, file_path: Path) -> list[str]:
+        self._required_db_cols = [db_col for db_col, col_spec in self.spec.columns.items() if col_spec.required]
+
+        # e.g. '"\t"': the delimiter together with the quotes that close/open adjacent fields
+        self._effective_delimiter = f"{self.spec.source.quote_char}{self.spec.source.delimiter}{self.spec.source.quote_char}"
+
+        # Byte forms for the cleaner, which works on undecoded input
+        self._quote_char_b = self.spec.source.quote_char.encode(self.spec.source.encoding)
+        self._complex_delimiter_b = self._effective_delimiter.encode(self.spec.source.encoding)
+
+    def _get_clean_header(self, file_path: Path) -> tuple[list[str], list[str]]:
         """
         Reads the first line, cleans it, renames duplicates, 
         MAPS to DB Column Names, and VALIDATES requirements.
+
+        Returns (physical headers as Arrow will read them, mapped DB column names).
         """
         encoding = self.spec.source.encoding
         quote_char = self.spec.source.quote_char
-        delimiter = self.spec.source.delimiter
-
-        effective_delimiter = f"{quote_char}{delimiter}{quote_char}"
 
-        with open(file_path, 'r', encoding=encoding, newline="") as f:
-            header_line = f.readline().rstrip('\r\n')
+        # Read raw bytes and decode the one line in a single call instead of text-mode incremental decoding
+        with open(file_path, 'rb') as f:
+            header_line = f.readline().rstrip(b'\r\n').decode(encoding)
 
         if not header_line:
             raise CSVExtractionError(f"CSV file is empty or missing header: {file_path}")
@@ -106,37 +106,22 @@ class FastCSVExtractor:
 
         # 1. Physical Cleanup
         clean_line = header_line[len(quote_char):-len(quote_char)]
-        clean_line = clean_line.replace(effective_delimiter, self.INTERNAL_DELIMITER_STR)
+        clean_line = clean_line.replace(self._effective_delimiter, self.INTERNAL_DELIMITER_STR)
 
-        reader = csv.reader([clean_line], delimiter=self.INTERNAL_DELIMITER_STR, quoting=csv.QUOTE_NONE)
-        try:
-            raw_headers = next(reader)
-        except StopIteration:
-            raise CSVExtractionError("Failed to parse cleaned header line.")
+        # Quoting is already stripped, so a plain split matches csv.reader with QUOTE_NONE
+        raw_headers = clean_line.split(self.INTERNAL_DELIMITER_STR) if clean_line else []
 
         # 2. Handle Physical Duplicates (e.g. "ID", "ID" -> "ID", "ID.1")
         unique_phys_headers = self._rename_duplicate_column_headers(raw_headers)
 
         # 3. Map to DB Schema & Validate
-        final_headers: list[str] = []
-        found_db_cols: set[str] = set()
-
-        for phys_header in unique_phys_headers:
-            if phys_header in self._header_map:
-                # We found a mapped column!
-                db_name = self._header_map[phys_header]
-                final_headers.append(db_name)
-                found_db_cols.add(db_name)
-            else:
-                # Pass through unknown columns as-is (e.g. 'Other Phone.1')
-                # Alternatively, you could prefix them like '_extra_Other Phone.1'
-                final_headers.append(phys_header)
+        # Unknown columns pass through as-is (e.g. 'Other Phone.1')
+        header_map = self._header_map
+        final_headers = [header_map.get(phys_header, phys_header) for phys_header in unique_phys_headers]
+        found_db_cols = {header_map[phys_header] for phys_header in unique_phys_headers if phys_header in header_map}
 
         # 4. Check Required Columns
-        missing_required: list[str] = []
-        for db_col, col_spec in self.spec.columns.items():
-            if col_spec.required and db_col not in found_db_cols:
-                missing_required.append(db_col)
+        missing_required = [db_col for db_col in self._required_db_cols if db_col not in found_db_cols]
 
         if missing_required:
             raise CSVExtractionError(
@@ -145,10 +130,14 @@ class FastCSVExtractor:
                 f"Found Headers (Mapped): {sorted(list(found_db_cols))}"
             )
 
-        return final_headers
+        return raw_headers, final_headers
 
     @staticmethod
     def _rename_duplicate_column_headers(header: list[str]) -> list[str]:
+        # Common case: no duplicates, nothing to rename
+        if len(set(header)) == len(header):
+            return header
+
         from collections import Counter
         counts: Counter[str] = Counter()
         new_header: list[str] = []
@@ -162,71 +151,175 @@ class FastCSVExtractor:
                 new_header.append(column)
         return new_header
 
-    def _stream_cleaned_lines(self, file_path: Path, expected_number_of_columns: int) -> Generator[bytes, None, None]:
+    def _clean_block(
+        self, block: bytes, quote_char_b: bytes, complex_delimiter_b: bytes, expected_number_of_columns: int
+    ) -> bytes | None:
         """
-        Yields CLEANED lines as raw bytes (Latin-1 safe).
+        Fast path: clean a block of whole lines in which every physical line is one complete record,
+        using a handful of C-level bytes.count/replace passes instead of per-line Python work.
+
+        Returns None when that cannot be established cheaply (broken records, empty lines, odd
+        line endings); the caller then runs the per-line cleaner, so the output is identical.
         """
-        encoding = self.spec.source.encoding
-        quote_char_b = self.spec.source.quote_char.encode(encoding)
-        delimiter_b = self.spec.source.delimiter.encode(encoding)
-        
-        complex_delimiter_b = quote_char_b + delimiter_b + quote_char_b
+        if not block.endswith(b'\n'):
+            return None
+        line_count = block.count(b'\n')
+
+        cleaned = block.replace(complex_delimiter_b, self.INTERNAL_DELIMITER_BYTE)
+        if cleaned.count(self.INTERNAL_DELIMITER_BYTE) != line_count * (expected_number_of_columns - 1):
+            return None
+
+        # Strip the first line's opening quote and the last line's closing quote + terminator
+        if not cleaned.startswith(quote_char_b):
+            return None
+        if cleaned.endswith(quote_char_b + b'\r\n'):
+            body = cleaned[len(quote_char_b):-(len(quote_char_b) + 2)]
+        elif cleaned.endswith(quote_char_b + b'\n'):
+            body = cleaned[len(quote_char_b):-(len(quote_char_b) + 1)]
+        else:
+            return None
+
+        # Every interior line break must be closing-quote + terminator + opening-quote.
+        # Only one terminator style is accepted per block, so a single replace pass can't
+        # create new boundary matches out of the quotes it leaves behind.
+        if line_count > 1:
+            crlf_boundary = quote_char_b + b'\r\n' + quote_char_b
+            lf_boundary = quote_char_b + b'\n' + quote_char_b
+            if body.count(crlf_boundary) == line_count - 1:
+                body = body.replace(crlf_boundary, b'\n')
+            elif body.count(lf_boundary) == line_count - 1:
+                body = body.replace(lf_boundary, b'\n')
+            else:
+                return None
 
-        with open(file_path, 'rb') as f:
-            _ = f.readline() # Skip header, we already processed it for mapping and validation
+        return body + b'\n'
 
-            buffer = b""
+    @staticmethod
+    def _split_at_line_boundaries(block: bytes, size: int) -> Iterator[bytes]:
+        """Yield consecutive pieces of `block` of roughly `size` bytes, each ending on a newline."""
+        start = 0
+        while start < len(block):
+            end = block.find(b'\n', start + size)
+            end = len(block) if end < 0 else end + 1
+            yield block[start:end]
+            start = end
 
-            def normalize(parts: list[bytes]) -> bytes:
-                if parts and parts[0].startswith(quote_char_b):
-                    parts[0] = parts[0][1:]
-                if parts and parts[-1].endswith(quote_char_b):
-                    parts[-1] = parts[-1][:-1]
+    def _stream_cleaned_lines(self, file_path: Path, expected_number_of_columns: int) -> Generator[bytes, None, None]:
+        """
+        Yields CLEANED lines as raw bytes (Latin-1 safe), starting with the header row.
 
-                return self.INTERNAL_DELIMITER_BYTE.join(parts) + b'\n'
-            
-            for physical in f:
-                # Strip line terminator before buffering, so it can't end up inside a field
-                line = physical.rstrip(b'\r\n')
-
-                buffer += line
-                if not buffer:
-                    buffer = b""
-                    continue  # Skip empty lines
-                
-                parts = buffer.split(complex_delimiter_b)
-
-                if len(parts) < expected_number_of_columns:
-                    logger.debug(f"Line has fewer columns than header after splitting by complex delimiter, buffering for next line.\n"
-                                 f"Line: {buffer}\n"
-                                 f"Expected Columns: {expected_number_of_columns}, Found: {len(parts)}")
-                    continue  # Line is not complete yet, read more
-
-                if len(parts) == expected_number_of_columns:
-                    yield normalize(parts)
-                    buffer = b""
-                    continue
-
-                raise CSVExtractionError(
-                    f"Line has more columns than header after splitting by complex delimiter.\n"
-                    f"Line: {buffer}\n"
-                    f"Expected Columns: {expected_number_of_columns}, Found: {len(parts)}"
-                )
+        The file is read in blocks of whole lines. Blocks where every line is a complete record
+        go through `_clean_block`; the rest (records broken across lines) use the per-line loop.
+        """
+        quote_char_b = self._quote_char_b
+        complex_delimiter_b = self._complex_delimiter_b
+
+        # A record broken across physical lines is buffered as fragments with a running delimiter
+        # count, so it is only joined and split once the count says it may be complete.
+        # Delimiters spanning a line break are picked up by counting in the last `overlap` bytes
+        # of the buffer plus the start of the next fragment; the result is an upper bound, and
+        # the split after the join gives the exact answer.
+        overlap = len(complex_delimiter_b) - 1
+
+        with open(file_path, 'rb') as f:
+            fragments: list[bytes] = []
+            delimiter_count = 0
+            tail = b""
+
+            def normalize(record: bytes) -> bytes:
+                # One C-level replace instead of split + join: no per-field bytes objects
+                cleaned = record.replace(complex_delimiter_b, self.INTERNAL_DELIMITER_BYTE)
+                if cleaned.startswith(quote_char_b):
+                    cleaned = cleaned[1:]
+                if cleaned.endswith(quote_char_b):
+                    cleaned = cleaned[:-1]
+
+                return cleaned + b'\n'
+
+            # Header was already validated; clean it too so Arrow reads the column names itself
+            yield normalize(f.readline().rstrip(b'\r\n'))
+
+            while block := f.read(self.CLEAN_BLOCK_SIZE_BYTES):
+                if not block.endswith(b'\n'):
+                    block += f.readline()  # Always end a block on a line boundary
+
+                # The fast path can't continue a record that is still buffered from the previous block
+                if not fragments:
+                    cleaned_block = self._clean_block(block, quote_char_b, complex_delimiter_b, expected_number_of_columns)
+                    if cleaned_block is not None:
+                        yield cleaned_block
+                        continue
+
+                # The whole block failed the fast path (usually one broken record). Retry it per
+                # sub-block, so only the sub-blocks around the broken record run line by line.
+                for piece in self._split_at_line_boundaries(block, self.CLEAN_SUBBLOCK_SIZE_BYTES):
+                    if not fragments and len(piece) < len(block):
+                        cleaned_piece = self._clean_block(piece, quote_char_b, complex_delimiter_b, expected_number_of_columns)
+                        if cleaned_piece is not None:
+                            yield cleaned_piece
+                            continue
+
+                    physical_lines = piece.split(b'\n')
+                    if not physical_lines[-1]:
+                        physical_lines.pop()  # Piece ended with a newline
+
+                    for physical in physical_lines:
+                        # Strip line terminator before buffering, so it can't end up inside a field
+                        line = physical.rstrip(b'\r\n')
+
+                        if not line:
+                            continue  # Skip empty lines (appending nothing can't complete a buffered record)
+
+                        delimiter_count += line.count(complex_delimiter_b)
+                        if tail:
+                            delimiter_count += (tail + line[:overlap]).count(complex_delimiter_b)
+                        fragments.append(line)
+                        if overlap:
+                            tail = line[-overlap:] if len(line) >= overlap else (tail + line)[-overlap:]
+
+                        if delimiter_count + 1 < expected_number_of_columns:
+                            # Lazy %-args: an incomplete line shouldn't pay for formatting a disabled debug message
+                            logger.debug("Line has fewer columns than header after splitting by complex delimiter, buffering for next line.\n"
+                                         "Line: %r\n"
+                                         "Expected Columns: %s, Found: %s", line, expected_number_of_columns, delimiter_count + 1)
+                            continue  # Line is not complete yet, read more
+
+                        buffer = b"".join(fragments) if len(fragments) > 1 else line
+                        found_columns = buffer.count(complex_delimiter_b) + 1
+
+                        if found_columns < expected_number_of_columns:
+                            # Estimate overshot (overlapping matches at a line break); keep buffering
+                            fragments = [buffer]
+                            delimiter_count = found_columns - 1
+                            continue
+
+                        if found_columns == expected_number_of_columns:
+                            yield normalize(buffer)
+                            fragments = []
+                            delimiter_count = 0
+                            tail = b""
+                            continue
+
+                        raise CSVExtractionError(
+                            f"Line has more columns than header after splitting by complex delimiter.\n"
+                            f"Line: {buffer}\n"
+                            f"Expected Columns: {expected_number_of_columns}, Found: {found_columns}"
+                        )
             # Optional: Flush trailing buffer if it ends cleanly
-            candidate = buffer.rstrip(b'\r\n')
+            candidate = b"".join(fragments).rstrip(b'\r\n')
             if candidate:
                 logger.debug(f"End of file reached, processing trailing buffer: {candidate}")  # Debug: Show trailing buffer processing
-                parts = candidate.split(complex_delimiter_b)
-                if len(parts) == expected_number_of_columns:
+                found_columns = candidate.count(complex_delimiter_b) + 1
+                if found_columns == expected_number_of_columns:
                     logger.debug(f"Trailing line has expected number of columns, yielding normalized line.\n"
                                  f"Line: {candidate}\n"
-                                 f"Expected Columns: {expected_number_of_columns}, Found: {len(parts)}")
-                    yield normalize(parts)
-                elif len(parts) != 0:
+                                 f"Expected Columns: {expected_number_of_columns}, Found: {found_columns}")
+                    yield normalize(candidate)
+                else:
                     raise CSVExtractionError(
                         f"Trailing line has more columns than header after splitting by complex delimiter.\n"
                         f"Line: {candidate}\n"
-                        f"Expected Columns: {expected_number_of_columns}, Found: {len(parts)}"
+                        f"Expected Columns: {expected_number_of_columns}, Found: {found_columns}"
                     )
 
 
@@ -236,25 +329,37 @@ class FastCSVExtractor:
         """
         # 1. Get Schema-Mapped Headers
         # This will fail fast if the file schema is invalid
-        mapped_header_names = self._get_clean_header(file_path)
+        physical_header_names, mapped_header_names = self._get_clean_header(file_path)
 
         # 2. Configure PyArrow
+        native_quoting = self.spec.source.native_quoting
+
         read_options = pv.ReadOptions(
             use_threads=True,
-            column_names=mapped_header_names, # Use the mapped names here!
-            autogenerate_column_names=False,
-            encoding=self.spec.source.encoding
+            autogenerate_column_names=False, # Arrow takes names from the header row; mapped after the read
+            encoding=self.spec.source.encoding,
+            block_size=self.READ_BLOCK_SIZE_BYTES # Also the Parquet row group size, see below
         )
 
-        parse_options = pv.ParseOptions(
-            delimiter=self.INTERNAL_DELIMITER_STR,
-            quote_char=False, 
-            double_quote=False,
-            newlines_in_values=False
-        )
+        if native_quoting:
+            parse_options = pv.ParseOptions(
+                delimiter=self.spec.source.delimiter,
+                quote_char=self.spec.source.quote_char,
+                double_quote=True,
+                newlines_in_values=True
+            )
+        else:
+            parse_options = pv.ParseOptions(
+                delimiter=self.INTERNAL_DELIMITER_STR,
+                quote_char=False, 
+                double_quote=False,
+                newlines_in_values=False
+            )
 
-        # Force strict string typing for all columns
-        column_types = {name: pa.string() for name in mapped_header_names}
+        # Force strict string typing for all columns.
+        # pa.string() rather than large_string: batches are capped at READ_BLOCK_SIZE_BYTES,
+        # far below the 2 GiB int32-offset limit, so wider offsets would only cost memory.
+        column_types = {name: pa.string() for name in physical_header_names}
         
         convert_options = pv.ConvertOptions(
             check_utf8=True,
@@ -263,30 +368,69 @@ class FastCSVExtractor:
         )
 
         try:
-            gen = self._stream_cleaned_lines(file_path, expected_number_of_columns=len(mapped_header_names))
-            stream_wrapper = GeneratorStream(gen)
+            if native_quoting:
+                # Arrow's C++ tokenizer reads the memory-mapped file directly, no Python per-line work
+                source: Any = pa.memory_map(str(file_path), "r")
+            else:
+                # Cleaned blocks are handed over as Arrow reads, keeping memory O(block), not O(file)
+                source = CleanedBlockStream(
+                    self._stream_cleaned_lines(file_path, expected_number_of_columns=len(mapped_header_names))
+                )
             
-            table = pv.read_csv(
-                stream_wrapper,
+            # Stream batch by batch, so only one block of parsed rows is held at a time
+            reader = pv.open_csv(
+                source,
                 read_options=read_options,
                 parse_options=parse_options,
                 convert_options=convert_options
             )
-            
-            row_count = table.num_rows
-            if row_count == 0:
-                return 0
 
-            # 3. Add System Columns (using standard arrays)
-            for col_name, val in system_cols.items():
-                if isinstance(val, str):
-                    pa_val = pa.array([val] * row_count, type=pa.string())
-                else:
-                    pa_val = pa.array([val] * row_count)
-                table = table.append_column(col_name, pa_val)
+            # 3. Physical -> DB column names (also resolves duplicate headers by position) and
+            #    System Columns (constant per file: broadcast one scalar per batch)
+            system_scalars = [
+                pa.scalar(val, type=pa.string() if isinstance(val, str) else None)
+                for val in system_cols.values()
+            ]
+            # Every CSV column is read as string, so the output schema is known up front
+            # and each batch is assembled against it without per-batch schema inference.
+            output_schema = pa.schema(
+                [pa.field(name, pa.string()) for name in mapped_header_names]
+                + [pa.field(name, scalar.type) for name, scalar in zip(system_cols, system_scalars)]
+            )
 
-            # 4. Write Parquet
-            pq.write_table(table, output_path, compression='snappy')
+            # 4. Write Parquet, one row group per batch
+            row_count = 0
+            writer: pq.ParquetWriter | None = None
+            try:
+                for batch in reader:
+                    if batch.num_rows == 0:
+                        continue
+
+                    arrays = batch.columns + [pa.repeat(scalar, batch.num_rows) for scalar in system_scalars]
+                    out_batch = pa.RecordBatch.from_arrays(arrays, schema=output_schema)
+
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            output_path,
+                            output_schema,
+                            compression='zstd',
+                            compression_level=1,
+                            use_dictionary=True,
+                            # Constant system columns need no min/max statistics
+                            write_statistics=mapped_header_names,
+                            data_page_size=1 << 20,
+                            dictionary_pagesize_limit=1 << 20,
+                        )
+                    writer.write_batch(out_batch)
+                    row_count += batch.num_rows
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            # Header-only file: fail like the whole-file read did, rather than return 0 with no
+            # data.parquet for the bundle manifest to point at
+            if row_count == 0:
+                raise CSVExtractionError("Empty CSV file")
 
             return row_count
 
@@ -1,10 +1,9 @@
 from datetime import datetime, timezone
-import json
 import logging
 from pathlib import Path
-import re
 from typing import Any
 
+import orjson
 import pyarrow as pa
 
 from ingestion.bundle_layout import BundleLayout
@@ -49,8 +48,9 @@ def get_arrow_schema_from_spec(spec: CSVIngestSpec) -> pa.Schema:
 
 def _parse_snapshot_date(file_path: Path, spec: CSVIngestSpec) -> Any | None:
     """Extract snapshot date from filename based on regex/format in the spec."""
-    if spec.source.filename_date_format and spec.source.filename_date_regex:
-        match = re.search(spec.source.filename_date_regex, file_path.name)
+    pattern = spec.source.filename_date_pattern
+    if spec.source.filename_date_format and pattern is not None:
+        match = pattern.search(file_path.name)
         if not match:
             raise ValueError(
                 f"No date match in {file_path.name} using {spec.source.filename_date_regex}"
@@ -62,6 +62,45 @@ def _parse_snapshot_date(file_path: Path, spec: CSVIngestSpec) -> Any | None:
     return None
 
 
+# Per-run constants, handed to each worker process once by init_extraction_worker
+_worker_specs: dict[str, CSVIngestSpec] = {}
+_worker_bundle_layout: BundleLayout | None = None
+
+
+def init_extraction_worker(
+    arrow_cpu_count: int,
+    specs: dict[str, CSVIngestSpec] | None = None,
+    bundle_layout: BundleLayout | None = None,
+) -> None:
+    """
+    ProcessPoolExecutor initializer: cap Arrow's CPU thread pool for this worker process,
+    and keep the run's specs / bundle layout so tasks don't have to carry them.
+    """
+    global _worker_bundle_layout
+    pa.set_cpu_count(arrow_cpu_count)
+    if specs is not None:
+        _worker_specs.update(specs)
+    _worker_bundle_layout = bundle_layout
+
+
+def execute_worker_extraction_task(
+    spec_name: str,
+    discovered: DiscoveredFile,
+    tmp_bundle_dir: Path,
+    final_bundle_dir: Path,
+) -> ExtractionResult:
+    """`execute_extraction_task` with the spec and bundle layout given to `init_extraction_worker`."""
+    if _worker_bundle_layout is None:
+        raise RuntimeError("Extraction worker not initialized with a bundle layout")
+    return execute_extraction_task(
+        _worker_specs[spec_name],
+        discovered,
+        tmp_bundle_dir,
+        final_bundle_dir,
+        _worker_bundle_layout,
+    )
+
+
 def execute_extraction_task(
     spec: CSVIngestSpec,
     discovered: DiscoveredFile,
@@ -81,8 +120,7 @@ def execute_extraction_task(
     # Idempotency check
     if bundle_layout.is_complete_bundle_dir(final_bundle_dir):
         manifest_path = bundle_layout.get_bundle_manifest_path(final_bundle_dir)
-        with open(manifest_path, "r") as f:
-            manifest = json.load(f)
+        manifest = orjson.loads(manifest_path.read_bytes())
         return ExtractionResult(
             extracted_bundle_path=final_bundle_dir,
             rows_extracted_total=int(manifest.get("metrics", {}).get("total_rows", 0) or 0),
@@ -118,7 +156,9 @@ def execute_extraction_task(
             "metrics": {"total_rows": int(total_rows)},
             "artifacts": [{"relpath": artifact_relpath, "type": "data", "count": int(total_rows)}],
         }
-        bundle_layout.write_bundle_manifest(tmp_bundle_dir, manifest)
+        # The tmp bundle is private until finalize_tmp_bundle renames it into place,
+        # so the manifest itself does not need a tmp -> rename of its own.
+        bundle_layout.write_bundle_manifest(tmp_bundle_dir, manifest, atomic=False)
 
         # Atomic promote tmp -> final
         bundle_layout.finalize_tmp_bundle(tmp_bundle_dir=tmp_bundle_dir, final_bundle_dir=final_bundle_dir)
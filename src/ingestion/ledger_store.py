@@ -1,9 +1,12 @@
+import json
 import logging
 import re
 from contextlib import contextmanager
 from datetime import datetime, timezone
 
 import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from ingestion.domain import DiscoveredFile, ExtractionResult, FileKey
 
@@ -14,6 +17,61 @@ def utc_now_naive() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
+def _json_param(value: set[str] | dict[str, list[str]]) -> str:
+    """Compact, stable JSON text for a *_json column (sets sorted, dict keys sorted)."""
+    if isinstance(value, (set, frozenset)):
+        value = sorted(value)
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+# Arrow type -> the type DuckDB's read_parquet reports for it (timestamps/decimals handled separately)
+_ARROW_TO_DUCKDB_TYPE: dict[pa.DataType, str] = {
+    pa.string(): "VARCHAR",
+    pa.large_string(): "VARCHAR",
+    pa.binary(): "BLOB",
+    pa.large_binary(): "BLOB",
+    pa.bool_(): "BOOLEAN",
+    pa.int8(): "TINYINT",
+    pa.int16(): "SMALLINT",
+    pa.int32(): "INTEGER",
+    pa.int64(): "BIGINT",
+    pa.uint8(): "UTINYINT",
+    pa.uint16(): "USMALLINT",
+    pa.uint32(): "UINTEGER",
+    pa.uint64(): "UBIGINT",
+    pa.float32(): "FLOAT",
+    pa.float64(): "DOUBLE",
+    pa.date32(): "DATE",
+    pa.null(): "INTEGER",
+}
+
+
+_CATALOG_RE = re.compile(r"\bAS\s+([A-Za-z_][A-Za-z0-9_]*)\b", re.IGNORECASE)
+
+_ARROW_ROWS_VIEW = "_ledger_rows_arrow"
+
+# Column order of the Arrow tables commit_batch builds; run_id / loaded_at_utc are bound per batch
+_LOADED_FILES_ARROW_COLUMNS = (
+    "source_name", "raw_file_metadata_signature", "spec_hash", "raw_file_path", "data_as_of_date", "rows_loaded",
+)
+_LOADED_FILE_TARGETS_ARROW_COLUMNS = (
+    "source_name", "raw_file_metadata_signature", "spec_hash", "target_table_fqn",
+)
+
+
+def _duckdb_type_for_arrow(arrow_type: pa.DataType) -> str | None:
+    """DuckDB column type for a Parquet column of `arrow_type`, or None if not known here."""
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_timestamp(arrow_type):
+        if arrow_type.tz is not None:
+            return "TIMESTAMP WITH TIME ZONE"
+        return "TIMESTAMP_NS" if arrow_type.unit == "ns" else "TIMESTAMP"
+    if pa.types.is_decimal128(arrow_type):
+        return f"DECIMAL({arrow_type.precision},{arrow_type.scale})"
+    return _ARROW_TO_DUCKDB_TYPE.get(arrow_type)
+
+
 class IngestionLedgerStore:
     """
     Minimal ingestion ledger backed by DuckDB + DuckLake.
@@ -36,15 +94,34 @@ class IngestionLedgerStore:
         self._connection: duckdb.DuckDBPyConnection | None = None
         self._catalog: str | None = None
 
+        # loaded_files as of the first read in this session, then kept current by commit_batch
+        self._completed_cache: set[FileKey] | None = None
+
+        # target table fqn -> {column: TYPE}; kept in step with ADD COLUMN, dropped on rollback
+        self._table_schema_cache: dict[str, dict[str, str]] = {}
+
+        # Statement text for the hot calls, built once the catalog is known (see _build_statements)
+        self._statements: dict[str, str] = {}
+
+        # Parquet schema -> [(column, DuckDB type)], or None when it needs DuckDB to describe it
+        self._parquet_schema_cache: dict[pa.Schema, list[tuple[str, str]] | None] = {}
+
     def __enter__(self) -> "IngestionLedgerStore":
         if self._connection is not None:
             raise RuntimeError("Store connection already open")
 
         conn = duckdb.connect(self._duckdb_path)
         conn.execute(self._ducklake_attach_sql)
+        # Bulk parquet loads don't need source row order; without it DuckDB can stream
+        # row groups from its scan threads straight into the target instead of re-ordering them.
+        conn.execute("SET preserve_insertion_order = false")
+        # Every commit_batch is its own transaction; at the default 16 MiB WAL threshold the
+        # metadata database checkpoints mid-run. Let the WAL grow and checkpoint once, in __exit__.
+        conn.execute("SET checkpoint_threshold = '1GB'")
 
         self._catalog = self._parse_catalog_name(self._ducklake_attach_sql)
         self._connection = conn
+        self._statements = self._build_statements()
 
         if self._auto_bootstrap:
             self._bootstrap()
@@ -56,9 +133,16 @@ class IngestionLedgerStore:
         if self._connection is None:
             return
         try:
+            # The raised checkpoint_threshold defers the WAL flush to here, whether or not the run failed
+            try:
+                self.checkpoint()
+            except duckdb.Error:
+                logger.warning("Ledger checkpoint on close failed; DuckDB will replay the WAL on next open.", exc_info=True)
             self._connection.close()
         finally:
             self._connection = None
+            self._completed_cache = None
+            self._table_schema_cache.clear()
 
     def _require_connection(self) -> duckdb.DuckDBPyConnection:
         if self._connection is None:
@@ -81,20 +165,15 @@ class IngestionLedgerStore:
         now = utc_now_naive()
 
         conn.execute(
-            f"""
-            INSERT INTO {self._ops('ingestion_runs')}
-            (run_id, started_at_utc, status, expected_sources_json, found_sources_json, missing_sources_json,
-             number_of_files_discovered)
-
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+            self._statements["start_run"],
             [
                 run_id,
                 now,
                 "RUNNING",
-                expected_sources,
-                discovered_sources,
-                missing_files_by_date,
+                # Bound as VARCHAR; the client can't convert a Python set to a DuckDB value
+                _json_param(expected_sources),
+                _json_param(discovered_sources),
+                _json_param(missing_files_by_date),
                 len(discovered_sources),
             ],
         )
@@ -113,11 +192,7 @@ class IngestionLedgerStore:
         now = utc_now_naive()
 
         conn.execute(
-            f"""
-            UPDATE {self._ops('ingestion_runs')}
-            SET finished_at_utc = ?, status = ?, error_message = ?, number_of_files_processed = ?, number_of_files_committed = ?
-            WHERE run_id = ?
-            """,
+            self._statements["finalize_run"],
             [
                 now,
                 status,
@@ -128,13 +203,39 @@ class IngestionLedgerStore:
             ],
         )
 
+    def checkpoint(self) -> None:
+        """
+        Flush the WAL deferred by the raised checkpoint_threshold. Runs on every __exit__.
+
+        Targets DuckLake's metadata database when it is a DuckDB file; `CHECKPOINT <catalog>`
+        on the DuckLake catalog itself would run its (much heavier) table maintenance instead.
+        """
+        conn = self._require_connection()
+        metadata_db = f"__ducklake_metadata_{self._catalog}"
+        exists = conn.execute(
+            "SELECT 1 FROM duckdb_databases() WHERE database_name = ?", [metadata_db]
+        ).fetchone()
+        conn.execute(f"CHECKPOINT {metadata_db}" if exists else "CHECKPOINT")
+
     def get_completed_file_keys(self) -> set[FileKey]:
+        """
+        Keys of all loaded files. Scanned once per connection, then maintained in memory
+        by commit_batch; the returned set is shared, so treat it as read-only.
+        """
+        if self._completed_cache is not None:
+            return self._completed_cache
+
         conn = self._require_connection()
-        rows = conn.execute(
-            f"SELECT source_name, raw_file_metadata_signature, spec_hash FROM {self._ops('loaded_files')};"
-        ).fetchall()
+        # Columnar fetch: one Arrow -> Python conversion per column instead of a tuple per row
+        keys = conn.execute(self._statements["completed_file_keys"]).fetch_arrow_table()
 
-        return {FileKey(source_name=r[0], raw_file_metadata_signature=r[1], spec_hash=r[2]) for r in rows}
+        self._completed_cache = {
+            FileKey(source_name=source_name, raw_file_metadata_signature=signature, spec_hash=spec_hash)
+            for source_name, signature, spec_hash in zip(
+                keys.column(0).to_pylist(), keys.column(1).to_pylist(), keys.column(2).to_pylist()
+            )
+        }
+        return self._completed_cache
 
     def commit_batch(
         self,
@@ -162,69 +263,80 @@ class IngestionLedgerStore:
 
         with self.transaction(conn) as tx:
             # 1) Ensure targets exist + bulk insert
+            existing_tables = self._existing_tables(tx, {fqn.split(".")[0] for fqn in load_plans})
+
             for table_fqn, files in load_plans.items():
                 if not files:
                     continue
 
                 partition_keys = table_partition_configs.get(table_fqn, set())
 
-                self._ensure_target_table_from_parquet(tx, table_fqn, files, partition_keys)
+                incoming, uniform = self._ensure_target_table_from_parquet(
+                    tx, table_fqn, files, partition_keys, existing_tables
+                )
+                # Explicit projection instead of BY NAME; union_by_name only when the files'
+                # schemas actually differ (otherwise it just reconciles identical footers)
+                column_list = ", ".join(f'"{col}"' for col, _ in incoming)
+                scan = "read_parquet(?)" if uniform else "read_parquet(?, union_by_name=true)"
                 tx.execute(
-                    f"INSERT INTO {table_fqn} BY NAME "
-                    f"SELECT * FROM read_parquet(?, union_by_name=true)",
+                    f"INSERT INTO {table_fqn} ({column_list}) SELECT {column_list} FROM {scan}",
                     [files],
                 )
 
             # 2) Write checkpoints (success only)
-            ledger_rows = [
-                (
-                    d.file_key.source_name,
-                    d.file_key.raw_file_metadata_signature,
-                    d.file_key.spec_hash,
-                    str(d.raw_file_path),
-                    r.data_as_of_date,
-                    int(r.rows_extracted_total),
-                    str(run_id),
-                    now,
-                )
-                for (d, r) in batch_results
-            ]
-
-            tx.executemany(
-                f"""
-                INSERT INTO {self._ops('loaded_files')}
-                (source_name, raw_file_metadata_signature, spec_hash, raw_file_path, data_as_of_date, rows_loaded, run_id, loaded_at_utc)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                ledger_rows,
+            # Columns are gathered into an Arrow table that DuckDB scans zero-copy,
+            # rather than marshalled across as Python tuples row by row.
+            ledger = pa.table(
+                {
+                    "source_name": pa.array([d.file_key.source_name for d, _ in batch_results], pa.string()),
+                    "raw_file_metadata_signature": pa.array(
+                        [d.file_key.raw_file_metadata_signature for d, _ in batch_results], pa.string()
+                    ),
+                    "spec_hash": pa.array([d.file_key.spec_hash for d, _ in batch_results], pa.string()),
+                    "raw_file_path": pa.array([str(d.raw_file_path) for d, _ in batch_results], pa.string()),
+                    "data_as_of_date": pa.array([r.data_as_of_date for _, r in batch_results], pa.date32()),
+                    "rows_loaded": pa.array([int(r.rows_extracted_total) for _, r in batch_results], pa.int64()),
+                }
+            )
+            self._insert_from_arrow(
+                tx, self._statements["insert_loaded_files"], ledger, run_id=str(run_id), loaded_at_utc=now
             )
 
             # 3) Write lineage: file -> target tables
-            lineage_rows: list[tuple[str, str, str, str, str, datetime]] = []
+            lineage_keys: list[FileKey] = []
+            lineage_targets: list[str] = []
+            # Files of one source usually share a single targets set; sort each distinct set once
+            sorted_targets_by_id: dict[int, list[str]] = {}
             for (d, r) in batch_results:
-                targets = file_targets.get(d.file_key, set())
-                for t in sorted(targets):
-                    lineage_rows.append(
-                        (
-                            d.file_key.source_name,
-                            d.file_key.raw_file_metadata_signature,
-                            d.file_key.spec_hash,
-                            t,
-                            str(run_id),
-                            now,
-                        )
-                    )
-
-            if lineage_rows:
-                tx.executemany(
-                    f"""
-                    INSERT INTO {self._ops('loaded_file_targets')}
-                    (source_name, raw_file_metadata_signature, spec_hash, target_table_fqn, run_id, loaded_at_utc)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    lineage_rows,
+                targets = file_targets.get(d.file_key)
+                if not targets:
+                    continue
+                sorted_targets = sorted_targets_by_id.get(id(targets))
+                if sorted_targets is None:
+                    sorted_targets = sorted_targets_by_id[id(targets)] = sorted(targets)
+                for t in sorted_targets:
+                    lineage_keys.append(d.file_key)
+                    lineage_targets.append(t)
+
+            if lineage_targets:
+                lineage = pa.table(
+                    {
+                        "source_name": pa.array([k.source_name for k in lineage_keys], pa.string()),
+                        "raw_file_metadata_signature": pa.array(
+                            [k.raw_file_metadata_signature for k in lineage_keys], pa.string()
+                        ),
+                        "spec_hash": pa.array([k.spec_hash for k in lineage_keys], pa.string()),
+                        "target_table_fqn": pa.array(lineage_targets, pa.string()),
+                    }
+                )
+                self._insert_from_arrow(
+                    tx, self._statements["insert_loaded_file_targets"], lineage, run_id=str(run_id), loaded_at_utc=now
                 )
 
+        # Only after COMMIT succeeded
+        if self._completed_cache is not None:
+            self._completed_cache.update(d.file_key for d, _ in batch_results)
+
     # ----------------------------
     # Bootstrap / helpers
     # ----------------------------
@@ -282,7 +394,7 @@ class IngestionLedgerStore:
 
     @staticmethod
     def _parse_catalog_name(attach_sql: str) -> str:
-        match = re.search(r"\bAS\s+([A-Za-z_][A-Za-z0-9_]*)\b", attach_sql, flags=re.IGNORECASE)
+        match = _CATALOG_RE.search(attach_sql)
         if not match:
             raise ValueError(
                 "Could not parse catalog name from ducklake_attach_sql. "
@@ -290,6 +402,52 @@ class IngestionLedgerStore:
             )
         return match.group(1)
 
+    def _build_statements(self) -> dict[str, str]:
+        """
+        SQL for the per-run / per-batch statements, formatted once per connection.
+        (The Python client has no prepared-statement handle, so this is the part we can hoist.)
+        """
+        def insert_from_arrow(table: str, columns: tuple[str, ...]) -> str:
+            column_list = ", ".join(columns)
+            return (
+                f"INSERT INTO {self._ops(table)} ({column_list}, run_id, loaded_at_utc) "
+                f"SELECT {column_list}, ?, ? FROM {_ARROW_ROWS_VIEW}"
+            )
+
+        return {
+            "start_run": f"""
+                INSERT INTO {self._ops('ingestion_runs')}
+                (run_id, started_at_utc, status, expected_sources_json, found_sources_json, missing_sources_json,
+                 number_of_files_discovered)
+
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+            "finalize_run": f"""
+                UPDATE {self._ops('ingestion_runs')}
+                SET finished_at_utc = ?, status = ?, error_message = ?, number_of_files_processed = ?, number_of_files_committed = ?
+                WHERE run_id = ?
+                """,
+            "completed_file_keys": f"SELECT source_name, raw_file_metadata_signature, spec_hash FROM {self._ops('loaded_files')};",
+            "insert_loaded_files": insert_from_arrow("loaded_files", _LOADED_FILES_ARROW_COLUMNS),
+            "insert_loaded_file_targets": insert_from_arrow("loaded_file_targets", _LOADED_FILE_TARGETS_ARROW_COLUMNS),
+        }
+
+    @staticmethod
+    def _insert_from_arrow(
+        conn: duckdb.DuckDBPyConnection,
+        insert_sql: str,
+        rows: pa.Table,
+        *,
+        run_id: str,
+        loaded_at_utc: datetime,
+    ) -> None:
+        """Run an insert_from_arrow statement over `rows` plus the batch-constant run_id / loaded_at_utc."""
+        conn.register(_ARROW_ROWS_VIEW, rows)
+        try:
+            conn.execute(insert_sql, [run_id, loaded_at_utc])
+        finally:
+            conn.unregister(_ARROW_ROWS_VIEW)
+
     def _ops(self, table: str) -> str:
         if not self._catalog:
             raise RuntimeError("Catalog not set (store not connected?)")
@@ -297,14 +455,79 @@ class IngestionLedgerStore:
 
     @contextmanager
     def transaction(self, conn: duckdb.DuckDBPyConnection):
-        conn.execute("BEGIN TRANSACTION")
+        conn.begin()
         try:
             yield conn
         except Exception:
-            conn.execute("ROLLBACK")
+            conn.rollback()
+            # Any ADD COLUMN in this transaction was undone too
+            self._table_schema_cache.clear()
             raise
         else:
-            conn.execute("COMMIT")
+            conn.commit()
+
+    def _describe_incoming_parquet(
+        self, conn: duckdb.DuckDBPyConnection, parquet_files: list[str]
+    ) -> tuple[list[tuple[str, str]], bool]:
+        """
+        (column, DuckDB type) pairs of `read_parquet(parquet_files, union_by_name=true)`,
+        and whether every file has the same schema (so union_by_name can be skipped).
+
+        Built from the Parquet footers via pyarrow (mapped types cached per distinct schema),
+        so the steady state doesn't plan a DESCRIBE query. Falls back to DuckDB for types not
+        in the map and for files that disagree on a column's type (DuckDB picks a supertype).
+        """
+        merged: dict[str, tuple[str, str]] = {}  # lower(name) -> (first-seen name, type), like union_by_name
+        first_schema: pa.Schema | None = None
+        uniform = True
+        for path in parquet_files:
+            schema = pq.read_schema(path)
+            if first_schema is None:
+                first_schema = schema
+            elif uniform and not schema.equals(first_schema):
+                uniform = False
+            if schema not in self._parquet_schema_cache:
+                mapped = [(field.name, _duckdb_type_for_arrow(field.type)) for field in schema]
+                self._parquet_schema_cache[schema] = (
+                    None if any(typ is None for _, typ in mapped) else [(name, typ) for name, typ in mapped if typ]
+                )
+            columns = self._parquet_schema_cache[schema]
+            if columns is None:
+                return self._describe_incoming_parquet_with_duckdb(conn, parquet_files), False
+
+            for name, typ in columns:
+                seen = merged.setdefault(name.lower(), (name, typ))
+                if seen[1] != typ:
+                    return self._describe_incoming_parquet_with_duckdb(conn, parquet_files), False
+
+        return list(merged.values()), uniform
+
+    @staticmethod
+    def _describe_incoming_parquet_with_duckdb(
+        conn: duckdb.DuckDBPyConnection, parquet_files: list[str]
+    ) -> list[tuple[str, str]]:
+        # We use LIMIT 0 to get the schema without reading all data
+        # rows are (column_name, column_type, null, key, default, extra)
+        rows = conn.execute(
+            "DESCRIBE SELECT * FROM read_parquet(?, union_by_name=true) LIMIT 0",
+            [parquet_files],
+        ).fetchall()
+        return [(r[0], str(r[1])) for r in rows]
+
+    @staticmethod
+    def _existing_tables(conn: duckdb.DuckDBPyConnection, catalogs: set[str]) -> set[tuple[str, str, str]]:
+        """(catalog, schema, table) of every table in `catalogs`, in a single catalog query."""
+        if not catalogs:
+            return set()
+        rows = conn.execute(
+            """
+            SELECT table_catalog, table_schema, table_name
+            FROM information_schema.tables
+            WHERE list_contains(?, table_catalog);
+            """,
+            [sorted(catalogs)],
+        ).fetchall()
+        return {(r[0], r[1], r[2]) for r in rows}
 
     def _ensure_target_table_from_parquet(
         self,
@@ -312,11 +535,14 @@ class IngestionLedgerStore:
         target_table_fqn: str,
         parquet_files: list[str],
         partition_keys: list[str],
-    ) -> None:
+        existing_tables: set[tuple[str, str, str]],
+    ) -> tuple[list[tuple[str, str]], bool]:
         """
-        Ensure table exists.
+        Ensure table exists (`existing_tables` from `_existing_tables`, one probe per batch).
         If missing: Create table derived from parquet schema, optionally partitioned.
         If exists: Evolve schema (add columns only).
+
+        Returns the incoming parquet columns as `_describe_incoming_parquet` does.
         """
         parts = target_table_fqn.split(".")
         if len(parts) != 3:
@@ -326,31 +552,13 @@ class IngestionLedgerStore:
         # Ensure schema exists
         conn.execute(f"CREATE SCHEMA IF NOT EXISTS {catalog}.{schema}")
 
-        # Check if table exists
-        exists = conn.execute(
-            """
-            SELECT 1
-            FROM information_schema.tables
-            WHERE table_catalog = ? AND table_schema = ? AND table_name = ?
-            LIMIT 1;
-            """,
-            [catalog, schema, table],
-        ).fetchone()
-
-        if not exists:
+        if (catalog, schema, table) not in existing_tables:
             # Introspect Parquet Schema
-            # We use LIMIT 0 to get the schema without reading all data
-            incoming = conn.execute(
-                "DESCRIBE SELECT * FROM read_parquet(?, union_by_name=true) LIMIT 0",
-                [parquet_files],
-            ).fetchall()
-            # incoming is list of (column_name, column_type, null, key, default, extra)
+            incoming, uniform = self._describe_incoming_parquet(conn, parquet_files)
 
             col_defs: list[str] = []
             incoming_col_names: set[str] = set()
-            for row in incoming:
-                col_name = row[0]
-                col_type = row[1]
+            for col_name, col_type in incoming:
                 col_defs.append(f'"{col_name}" {col_type}')
                 incoming_col_names.add(col_name)
 
@@ -375,26 +583,29 @@ class IngestionLedgerStore:
                 alter_sql = f"ALTER TABLE {target_table_fqn} SET PARTITIONED BY ({keys_str})"
                 conn.execute(alter_sql)
             
-            return
+            return incoming, uniform
 
         # --- Table exists: evolve schema (add columns only) ---
 
-        # Current table schema
-        table_cols = conn.execute(f"DESCRIBE {target_table_fqn}").fetchall()
-        table_types: dict[str, str] = {r[0]: str(r[1]).upper() for r in table_cols}
+        # Current table schema: described once per connection, then kept in step below
+        table_types = self._table_schema_cache.get(target_table_fqn)
+        if table_types is None:
+            # pragma_table_info reads the catalog entry directly; DESCRIBE plans a query for it
+            table_cols = conn.execute(
+                "SELECT name, upper(type) FROM pragma_table_info(?)", [target_table_fqn]
+            ).fetchall()
+            table_types = dict(table_cols)
+            self._table_schema_cache[target_table_fqn] = table_types
 
         # Incoming parquet schema
-        incoming = conn.execute(
-            "DESCRIBE SELECT * FROM read_parquet(?, union_by_name=true) LIMIT 0",
-            [parquet_files],
-        ).fetchall()
-        incoming_types: dict[str, str] = {r[0]: str(r[1]).upper() for r in incoming}
+        incoming, uniform = self._describe_incoming_parquet(conn, parquet_files)
+        incoming_types: dict[str, str] = {col: typ.upper() for col, typ in incoming}
 
-        # Add missing columns
+        # Diff first, so a type mismatch fails before any DDL is issued
+        missing_cols: list[tuple[str, str]] = []
         for col, typ in incoming_types.items():
             if col not in table_types:
-                logger.info("Evolving schema for %s: Adding column %s %s", target_table_fqn, col, typ)
-                conn.execute(f'ALTER TABLE {target_table_fqn} ADD COLUMN "{col}" {typ}')
+                missing_cols.append((col, typ))
                 continue
 
             # Type mismatch? Fail fast.
@@ -403,4 +614,13 @@ class IngestionLedgerStore:
                     f"Schema mismatch for {target_table_fqn}.{col}: "
                     f"table has {table_types[col]} but parquet has {typ}. "
                     f"Refusing to auto-coerce."
-                )
\ No newline at end of file
+                )
+
+        # Add missing columns. DuckDB allows one ALTER command per statement; they all
+        # land in the batch transaction, so the catalog is still written once per commit.
+        for col, typ in missing_cols:
+            logger.info("Evolving schema for %s: Adding column %s %s", target_table_fqn, col, typ)
+            conn.execute(f'ALTER TABLE {target_table_fqn} ADD COLUMN "{col}" {typ}')
+            table_types[col] = typ
+
+        return incoming, uniform
\ No newline at end of file
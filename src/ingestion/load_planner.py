@@ -1,8 +1,9 @@
-import json
 import logging
 from pathlib import Path
 from typing import Sequence
 
+import orjson
+
 from ingestion.csv_config import CSVIngestSpec
 from ingestion.domain import FileKey, LoadTarget
 from core import settings
@@ -28,8 +29,7 @@ class DefaultLoadPlanner:
         if not manifest_path.exists():
             raise FileNotFoundError(f"Bundle manifest missing: {manifest_path}")
 
-        with open(manifest_path, "r") as f:
-            manifest = json.load(f)
+        manifest = orjson.loads(manifest_path.read_bytes())
 
         if file_key.source_name not in self.specs:
             raise ValueError(f"No configuration spec found for {file_key.source_name}")
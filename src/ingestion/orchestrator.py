@@ -3,10 +3,11 @@ from __future__ import annotations
 import fnmatch
 import logging
 import os
+import re
 import time
-from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Protocol, Sequence
 
@@ -14,7 +15,7 @@ from ingestion.bundle_layout import BundleLayout
 from ingestion.business_calendar import BusinessCalendar
 from ingestion.csv_config import CSVIngestSpec
 from ingestion.domain import DiscoveredFile, ExtractionResult, FileKey, LoadTarget, RunContext
-from ingestion.extraction_task import execute_extraction_task
+from ingestion.extraction_task import execute_worker_extraction_task, init_extraction_worker
 from ingestion.ledger_store import IngestionLedgerStore
 from ingestion.utils import calculate_spec_hash, parse_data_snapshot_date_from_filename
 
@@ -28,10 +29,17 @@ class LoadPlanner(Protocol):
 
 @dataclass(frozen=True)
 class OrchestrationConfig:
-    max_parallel_extractions: int = 14
+    max_parallel_extractions: int = field(default_factory=lambda: os.cpu_count() or 1)
     batch_loading_size: int = 50
     batch_loading_max_latency_seconds: float = 30.0
-    idle_sleep_seconds: float = 0.05
+    # Adaptive batching: starting from batch_loading_size, the batch grows while extraction keeps
+    # the pool saturated and commits stay under the target, and shrinks when commits overrun it.
+    min_batch_loading_size: int = 10
+    max_batch_loading_size: int = 200
+    target_commit_latency_seconds: float = 10.0
+    # Staging tidy-up (tmp run dirs, trash, empty source dirs) walks directories; between
+    # commits it runs at most this often, and always once at the end of the run.
+    staging_cleanup_interval_seconds: float = 60.0
 
     holiday_calendar_file_glob_pattern: str = "DD_holidays_table_*.txt"  
 
@@ -60,11 +68,23 @@ class Orchestrator:
         self.store = store
         self.bundle_layout = bundle_layout
         self.specs = {s.name: s for s in specs}
+        # Source globs compiled once; fnmatch.fnmatch would re-normalize and look up its
+        # pattern cache for every (file, spec) pair during discovery.
+        self._spec_file_patterns: list[tuple[str, CSVIngestSpec, re.Pattern[str]]] = [
+            (name, spec, re.compile(fnmatch.translate(os.path.normcase(spec.source.file_path_glob_pattern))))
+            for name, spec in self.specs.items()
+        ]
+        # Specs are fixed for the orchestrator's lifetime; hash each once, not once per file
+        self._spec_hashes: dict[str, str] = {name: calculate_spec_hash(spec) for name, spec in self.specs.items()}
         self.load_planner = load_planner
         self.config = config
         self.data_dir = data_dir
 
         self.business_calendar = self._initialize_business_calendar()
+
+        self._batch_loading_size: int = config.batch_loading_size
+        self._commit_latency_ema: float | None = None
+        self._last_staging_cleanup: float = time.monotonic()
     
     def _initialize_business_calendar(self):
         holiday_files = list(self.data_dir.glob(self.config.holiday_calendar_file_glob_pattern))
@@ -78,41 +98,59 @@ class Orchestrator:
         return BusinessCalendar(selected_file)
 
     def run(self, ctx: RunContext) -> None:
-        with self.store as store, ProcessPoolExecutor(max_workers=self.config.max_parallel_extractions) as executor:
+        # Each worker process gets an equal share of the cores for Arrow's own thread pool,
+        # instead of every process sizing its pool to the whole machine.
+        arrow_threads_per_worker = max(1, (os.cpu_count() or 1) // self.config.max_parallel_extractions)
+        # Specs and the bundle layout are pickled once per worker here, not once per task
+        executor = ProcessPoolExecutor(
+            max_workers=self.config.max_parallel_extractions,
+            initializer=init_extraction_worker,
+            initargs=(arrow_threads_per_worker, self.specs, self.bundle_layout),
+        )
+
+        with self.store as store, executor:
             completed_keys = store.get_completed_file_keys()
 
             all_files = self._discover_files()
-            pending = [f for f in all_files if f.file_key not in completed_keys]
+            pending = deque(f for f in all_files if f.file_key not in completed_keys)
+
+            migrated = self.bundle_layout.migrate_legacy_bundle_dirs(f.file_key for f in pending)
+            if migrated:
+                logger.info("Migrated %s legacy bundle directories to xxh3 bundle ids.", migrated)
 
             logger.info("Discovery found %s files. %s require processing.", len(all_files), len(pending))
 
             in_flight: dict[Future[ExtractionResult], DiscoveredFile] = {}
             buffer: list[tuple[DiscoveredFile, ExtractionResult]] = []
-            last_commit_time = time.time()
+            last_commit_time = time.monotonic()
 
             try:
                 while pending or in_flight:
                     # Dispatch
                     while len(in_flight) < self.config.max_parallel_extractions and pending:
-                        task = pending.pop(0)
-                        spec = self.specs[task.file_key.source_name]
+                        task = pending.popleft()
 
                         tmp_dir = self.bundle_layout.get_tmp_bundle_directory_for(task.file_key, claim_token=ctx.run_id)
                         final_dir = self.bundle_layout.get_bundle_directory_for(task.file_key)
 
                         fut = executor.submit(
-                            execute_extraction_task,
-                            spec,
+                            execute_worker_extraction_task,
+                            task.file_key.source_name,
                             task,
                             tmp_dir,
                             final_dir,
-                            self.bundle_layout,
                         )
                         in_flight[fut] = task
 
-                    # Collect
+                    # Collect: block until an extraction finishes, or until a non-empty buffer goes stale
                     if in_flight:
-                        done, _ = wait(in_flight.keys(), timeout=0.1, return_when=FIRST_COMPLETED)
+                        timeout = None
+                        if buffer:
+                            timeout = max(
+                                0.0,
+                                self.config.batch_loading_max_latency_seconds - (time.monotonic() - last_commit_time),
+                            )
+                        done, _ = wait(in_flight.keys(), timeout=timeout, return_when=FIRST_COMPLETED)
                         for fut in done:
                             task = in_flight.pop(fut)
                             try:
@@ -123,27 +161,61 @@ class Orchestrator:
 
                     # Commit hysteresis
                     buffer_size = len(buffer)
-                    time_since_last = time.time() - last_commit_time
-
-                    is_full = buffer_size >= self.config.batch_loading_size
-                    is_stale = buffer_size > 0 and time_since_last >= self.config.batch_loading_max_latency_seconds
+                    now = time.monotonic()
+                    time_since_last = now - last_commit_time
+
+                    is_full = buffer_size >= self._optimal_batch_size(len(in_flight), bool(pending))
+                    is_stale = (
+                        not is_full
+                        and buffer_size > 0
+                        and time_since_last >= self.config.batch_loading_max_latency_seconds
+                    )
                     is_done = buffer_size > 0 and not pending and not in_flight
 
                     if is_full or is_stale or is_done:
                         self._commit_batch(store, ctx, buffer)
+                        last_commit_time = time.monotonic()
+                        self._record_commit_latency(last_commit_time - now, filled=is_full)
                         buffer.clear()
-                        last_commit_time = time.time()
 
                     if not pending and not in_flight:
                         break
-
-                    time.sleep(self.config.idle_sleep_seconds)
             finally:
                 # End-of-run tidy-up (safe even if nothing committed)
                 self.bundle_layout.cleanup_after_commit(run_id=ctx.run_id)
 
             logger.info("Ingestion run complete.")
 
+    def _optimal_batch_size(self, in_flight_count: int, has_pending: bool) -> int:
+        """
+        Current commit threshold.
+
+        Called every loop turn, so it only reads state; `_record_commit_latency` moves it.
+        `in_flight_count` / `has_pending` are the queue-pressure signal: with no backlog
+        there's nothing to gain from waiting for a bigger batch.
+        """
+        if not has_pending and in_flight_count < self.config.max_parallel_extractions:
+            return min(self._batch_loading_size, self.config.batch_loading_size)
+        return self._batch_loading_size
+
+    def _record_commit_latency(self, seconds: float, *, filled: bool) -> None:
+        """
+        Shrink the batch when commits run over target; grow it only when the batch filled
+        up (extraction outpaces commits), not when it was flushed as stale or at the end.
+        """
+        ema = self._commit_latency_ema
+        self._commit_latency_ema = ema = seconds if ema is None else 0.3 * seconds + 0.7 * ema
+
+        size = self._batch_loading_size
+        if ema > self.config.target_commit_latency_seconds:
+            size = int(size * 0.75)
+        elif filled:
+            size = int(size * 1.25) + 1
+        self._batch_loading_size = max(
+            self.config.min_batch_loading_size, min(self.config.max_batch_loading_size, size)
+        )
+        logger.debug("Commit took %.2fs (ema %.2fs); batch size now %s", seconds, ema, self._batch_loading_size)
+
     def _commit_batch(
         self,
         store: IngestionLedgerStore,
@@ -158,31 +230,51 @@ class Orchestrator:
         load_plans: dict[str, list[str]] = {}
         file_targets: dict[FileKey, set[str]] = {}
 
+        # One set object per distinct target set, so commit_batch sorts each only once
+        shared_targets: dict[frozenset[str], set[str]] = {}
+
         table_partitions: dict[str, set[str]] = {}
 
+        # Planning reads each bundle's manifest; overlap those reads instead of paying the
+        # file-open latency once per bundle (it adds up on network storage)
+        with ThreadPoolExecutor(max_workers=min(16, len(buffer))) as manifest_readers:
+            planned_targets = list(
+                manifest_readers.map(
+                    lambda item: self.load_planner.plan_load(item[0].file_key, item[1].extracted_bundle_path),
+                    buffer,
+                )
+            )
+
         # Plan loads + lineage
-        for discovered, res in buffer:
+        for (discovered, res), targets in zip(buffer, planned_targets):
             spec = self.specs[discovered.file_key.source_name]
-            targets = self.load_planner.plan_load(discovered.file_key, res.extracted_bundle_path)
 
+            target_fqns: set[str] = set()
             for t in targets:
                 load_plans.setdefault(t.target_table_fqn, []).append(
                     str(res.extracted_bundle_path / t.artifact_relpath)
                 )
-                file_targets.setdefault(discovered.file_key, set()).add(t.target_table_fqn)
+                target_fqns.add(t.target_table_fqn)
 
                 if spec.partition_by:
                     table_partitions[t.target_table_fqn] = set(spec.partition_by)
 
+            if target_fqns:
+                target_fqns |= file_targets.get(discovered.file_key, set())
+                file_targets[discovered.file_key] = shared_targets.setdefault(frozenset(target_fqns), target_fqns)
+
         # Atomic commit (data + checkpoints + lineage)
         store.commit_batch(buffer, load_plans, run_id=ctx.run_id, file_targets=file_targets, table_partition_configs=table_partitions)
 
-        # Post-commit cleanup
-        for _, res in buffer:
-            self.bundle_layout.delete_bundle_dir(res.extracted_bundle_path)
+        # Post-commit cleanup: each rmtree is a tree walk of unlink syscalls, so run them side by side
+        with ThreadPoolExecutor(max_workers=min(8, len(buffer))) as bundle_deleters:
+            list(bundle_deleters.map(self.bundle_layout.delete_bundle_dir, (res.extracted_bundle_path for _, res in buffer)))
 
-        # Also prune any tmp run dirs + trash + empty sources
-        self.bundle_layout.cleanup_after_commit(run_id=ctx.run_id)
+        # Also prune any tmp run dirs + trash + empty sources (debounced; run() does a final pass)
+        now = time.monotonic()
+        if now - self._last_staging_cleanup >= self.config.staging_cleanup_interval_seconds:
+            self.bundle_layout.cleanup_after_commit(run_id=ctx.run_id)
+            self._last_staging_cleanup = now
 
     def _discover_files(self) -> list[DiscoveredFile]:
         discovered: list[DiscoveredFile] = []
@@ -192,13 +284,14 @@ class Orchestrator:
                 if not entry.is_file():
                     continue
 
-                for spec_name, spec in self.specs.items():
-                    if not fnmatch.fnmatch(entry.name, spec.source.file_path_glob_pattern):
+                match_name = os.path.normcase(entry.name)
+                for spec_name, spec, file_pattern in self._spec_file_patterns:
+                    if not file_pattern.match(match_name):
                         continue
 
                     snapshot_date = parse_data_snapshot_date_from_filename(
                         entry.name, 
-                        spec.source.filename_date_regex,
+                        spec.source.filename_date_pattern,
                         spec.source.filename_date_format
                     )
 
@@ -207,14 +300,13 @@ class Orchestrator:
                         data_as_of_date = self.business_calendar.get_previous_business_day(snapshot_date.date())
                     
                     stat = entry.stat()
-                    mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).replace(tzinfo=None)
                     metadata_signature = f"{entry.name}_{stat.st_size}_{stat.st_mtime}"
 
 
                     file_key = FileKey(
                         source_name=spec_name,
                         raw_file_metadata_signature=metadata_signature,
-                        spec_hash=calculate_spec_hash(spec),
+                        spec_hash=self._spec_hashes[spec_name],
                     )
 
                     discovered.append(
@@ -222,7 +314,7 @@ class Orchestrator:
                             file_key=file_key,
                             raw_file_path=Path(entry.path).absolute(),
                             raw_file_size_bytes=stat.st_size,
-                            raw_file_mtime_utc=mtime,
+                            raw_file_mtime_epoch=stat.st_mtime,
                             data_as_of_date=data_as_of_date
                         )
                     )
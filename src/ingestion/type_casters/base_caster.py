@@ -1,30 +1,91 @@
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import ClassVar
 from pydantic import BaseModel, ConfigDict, Field
 
 
+# Stands in for the column alias while a caster's plan template is built; never valid SQL
+_ALIAS_PLACEHOLDER = "\x00column_alias\x00"
+
+
 @dataclass(frozen=True)
 class CasterPlan:
-    # alias -> SQL string expression
-    partials: dict[str, str]
+    # (alias, SQL string expression) pairs in dependency order; later partials may reference earlier ones
+    partials: tuple[tuple[str, str], ...]
     # sql string expression for the "final typed value" of this column, which is allowed to reference partials by alias
     value_expression: str
 
 
+# (caster type, config JSON, key extras) -> plan template; configs are few and fixed per process
+_PLAN_TEMPLATES: dict[tuple[type, str, tuple], CasterPlan] = {}
+
+
 class CasterBase(BaseModel, ABC):
     output_type: str
     model_config = ConfigDict(extra="forbid", strict=True)
     null_strings: set[str] = Field(default_factory=lambda: {""})
 
+    # Set by casters whose value SQL needs no partials and no config; "{col}" marks the column
+    INLINE_EXPRESSION_TEMPLATE: ClassVar[str | None] = None
+
     @abstractmethod
-    def plan(self, column_alias: str) -> CasterPlan: ...
+    def _build_plan(self, column_alias: str, *key_extras) -> CasterPlan: ...
+
+    def _template_key_extras(self) -> tuple:
+        """
+        Inputs to _build_plan besides the config (e.g. today's year), read on every plan() call.
+        They are part of the template cache key and are passed on to _build_plan.
+        """
+        return ()
+
+    @classmethod
+    def inline_sql(cls, column_alias: str) -> str | None:
+        """
+        Value SQL for trivial casters, formatted straight from the class template without a
+        caster instance or CasterPlan. None means the caster has partials: use plan().
+        """
+        if cls.INLINE_EXPRESSION_TEMPLATE is None:
+            return None
+        return cls.INLINE_EXPRESSION_TEMPLATE.format(col=column_alias)
+
+    @cached_property
+    def _config_json(self) -> str:
+        return self.model_dump_json()
+
+    def _plan_template(self) -> CasterPlan:
+        # Shared across casters with identical config (e.g. every default DateCaster in a spec)
+        key_extras = self._template_key_extras()
+        key = (type(self), self._config_json, key_extras)
+        template = _PLAN_TEMPLATES.get(key)
+        if template is None:
+            template = _PLAN_TEMPLATES[key] = self._build_plan(_ALIAS_PLACEHOLDER, *key_extras)
+        return template
+
+    def plan(self, column_alias: str) -> CasterPlan:
+        """
+        SQL plan for one column. The caster's config is fixed, so the plan is built once per
+        config (and key extras) as a template and each call only substitutes the alias (into a fresh CasterPlan).
+        """
+        template = self._plan_template()
+        return CasterPlan(
+            partials=tuple(
+                (alias.replace(_ALIAS_PLACEHOLDER, column_alias), expression.replace(_ALIAS_PLACEHOLDER, column_alias))
+                for alias, expression in template.partials
+            ),
+            value_expression=template.value_expression.replace(_ALIAS_PLACEHOLDER, column_alias),
+        )
 
     def build_alias(self, column_alias: str, step: str) -> str:
         return f"{column_alias}__{step}"
 
+    @cached_property
+    def _null_tokens_sql(self) -> str:
+        return ", ".join(f"'{s.upper()}'" for s in self.null_strings)
+
     def get_nullify_sql(self, column_name: str) -> str:
         """Standardized nullification: returns NULL if token matches, else TRIM(val)"""
-        tokens = ", ".join(f"'{s.upper()}'" for s in self.null_strings)
+        tokens = self._null_tokens_sql
         return f"""
             CASE 
                 WHEN UPPER(TRIM("{column_name}")) IN ({tokens}) THEN NULL 
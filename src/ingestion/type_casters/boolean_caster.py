@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Literal
 from pydantic import Field, model_validator
 
@@ -20,12 +21,19 @@ class BooleanCaster(CasterBase):
                 raise ValueError(f"true_values and false_values overlap: {sorted(overlap)}")
         return self
 
-    def plan(self, column_alias: str) -> CasterPlan:
+    @cached_property
+    def _values_sql_lists(self) -> tuple[str, str]:
+        """Quoted (true, false) IN-lists; they don't depend on the column, so build them once."""
+        return (
+            ", ".join(sql_quote(value.upper()) for value in self.true_values),
+            ", ".join(sql_quote(value.upper()) for value in self.false_values),
+        )
+
+    def _build_plan(self, column_alias: str) -> CasterPlan:
         clean_alias = self.build_alias(column_alias, "clean")
         clean_expression = f"UPPER(TRIM({column_alias}))"
 
-        true_values_sql_list = ", ".join(sql_quote(value.upper()) for value in self.true_values)
-        false_values_sql_list = ", ".join(sql_quote(value.upper()) for value in self.false_values)
+        true_values_sql_list, false_values_sql_list = self._values_sql_lists
 
         if self.true_values and self.false_values:
             value_expression = f"CASE WHEN {clean_alias} IN ({true_values_sql_list}) THEN TRUE WHEN {clean_alias} IN ({false_values_sql_list}) THEN FALSE ELSE NULL END"
@@ -37,7 +45,7 @@ class BooleanCaster(CasterBase):
             value_expression = f"CASE WHEN {column_alias} IS NULL THEN NULL WHEN {clean_alias} IN ({false_values_sql_list}) THEN FALSE ELSE TRUE END"
 
         else:
-            value_expression = f"TRY_CAST(TRIM({column_alias}) AS BOOLEAN)"
+            value_expression = f"TRY_CAST(NULLIF(TRIM({column_alias}), '') AS BOOLEAN)"
 
         if self.null_policy == "false":
             value_expression = f"COALESCE(({value_expression}), FALSE)"
@@ -48,6 +56,6 @@ class BooleanCaster(CasterBase):
         else:  # "preserve"
             value_expression = f"({value_expression})"
 
-        return CasterPlan(partials={clean_alias: clean_expression}, value_expression=value_expression)
+        return CasterPlan(partials=((clean_alias, clean_expression),), value_expression=value_expression)
 
 
@@ -6,16 +6,9 @@ from pydantic import model_validator
 from ingestion.type_casters.base_caster import CasterBase, CasterPlan
 
 
-def _iso_from_parts_str(year_sql: str, month_sql: str, day_sql: str) -> str:
-    year = f"CAST({year_sql} AS VARCHAR)"
-    month = f"LPAD(CAST({month_sql} AS VARCHAR), 2, '0')"
-    day = f"LPAD(CAST({day_sql} AS VARCHAR), 2, '0')"
-    # return f"CONCAT({year}, '-', {month}, '-', {day})"
-    return f"{year} || '-' || {month} || '-' || {day}"
-
-
 def _yy_to_yyyy_sql_str(yy_sql: str, current_year: int, mode: str, pivot: int | None) -> str:
-    y2 = f"CAST({yy_sql} AS INT)"
+    # TRY_CAST: stays NULL-safe if the slice is ever evaluated on a short or non-digit string
+    y2 = f"TRY_CAST({yy_sql} AS INT)"
     century = (current_year // 100) * 100
 
     if mode == "pivot":
@@ -33,6 +26,14 @@ def _yy_to_yyyy_sql_str(yy_sql: str, current_year: int, mode: str, pivot: int |
     raise ValueError(f"Invalid interpret_mode '{mode}'")
 
 
+def _make_date_sql_str(y_sql: str, m_sql: str, d_sql: str) -> str:
+    # MAKE_DATE builds the date from integers (no string round trip) but raises on an invalid
+    # day, and TRY() falls back to row-at-a-time on error, so range-check up front instead.
+    leap = f"({y_sql} % 4 = 0 AND ({y_sql} % 100 <> 0 OR {y_sql} % 400 = 0))::INT"
+    month_days = f"CASE WHEN {m_sql} = 2 THEN 28 + {leap} WHEN {m_sql} IN (4, 6, 9, 11) THEN 30 ELSE 31 END"
+    return f"CASE WHEN {m_sql} BETWEEN 1 AND 12 AND {d_sql} BETWEEN 1 AND {month_days} THEN MAKE_DATE({y_sql}, {m_sql}, {d_sql}) END"
+
+
 class DateCaster(CasterBase):
     output_type: Literal["date"]
     interpret_mode: Literal["prefer_past", "prefer_future", "pivot"] = "pivot"
@@ -44,43 +45,41 @@ class DateCaster(CasterBase):
             raise ValueError("pivot_year_short must be provided for interpret_mode='pivot'")
         return self
 
-    def plan(self, column_alias: str) -> CasterPlan:
-        current_year = date.today().year
+    def _template_key_extras(self) -> tuple[int]:
+        # The century logic depends on the current year; keying on it rebuilds the template after New Year
+        return (date.today().year,)
+
+    def _build_plan(self, column_alias: str, current_year: int) -> CasterPlan:
         digits_alias = self.build_alias(column_alias, "digits")
         dlen_alias = self.build_alias(column_alias, "digits_length")
-        yyyy1_alias = self.build_alias(column_alias, "yyyy1")
-        yyyy2_alias = self.build_alias(column_alias, "yyyy2")
 
         # Define the base digit-stripping expression
         digits_expression = f"REGEXP_REPLACE(TRIM({column_alias}), '[^0-9]', '', 'g')"
 
         # Build self-contained expressions for the `base` CTE
-        partials = {
-            digits_alias: digits_expression,
-            dlen_alias: f"LENGTH({digits_alias})",
-            yyyy1_alias: _yy_to_yyyy_sql_str(
-                f"SUBSTR({digits_alias}, 1, 2)", current_year, self.interpret_mode, self.pivot_year_short
-            ),
-            yyyy2_alias: _yy_to_yyyy_sql_str(
-                f"SUBSTR({digits_alias}, 5, 2)", current_year, self.interpret_mode, self.pivot_year_short
-            ),
-        }
+        partials = (
+            (digits_alias, digits_expression),
+            (dlen_alias, f"LENGTH({digits_alias})"),
+        )
 
         # --- Expressions for the `typed` CTE can now safely use the aliases from `base` ---
-        eight_ymd_iso = _iso_from_parts_str(
-            f"SUBSTR({digits_alias}, 1, 4)", f"SUBSTR({digits_alias}, 5, 2)", f"SUBSTR({digits_alias}, 7, 2)"
+        # The 8-digit string is parsed directly by DuckDB's strptime (first format that fits
+        # wins). Six-digit years go through the configured century logic instead of %y and the
+        # date is built from integers; that work lives inside the 6-digit branch only.
+        yyyy1 = _yy_to_yyyy_sql_str(f"SUBSTR({digits_alias}, 1, 2)", current_year, self.interpret_mode, self.pivot_year_short)
+        yyyy2 = _yy_to_yyyy_sql_str(f"SUBSTR({digits_alias}, 5, 2)", current_year, self.interpret_mode, self.pivot_year_short)
+        six_ymd = _make_date_sql_str(f"({yyyy1})", f"CAST(SUBSTR({digits_alias}, 3, 2) AS INT)", f"CAST(SUBSTR({digits_alias}, 5, 2) AS INT)")
+        six_mdy = _make_date_sql_str(f"({yyyy2})", f"CAST(SUBSTR({digits_alias}, 1, 2) AS INT)", f"CAST(SUBSTR({digits_alias}, 3, 2) AS INT)")
+
+        digits_expr = (
+            f"CASE {dlen_alias} "
+            f"WHEN 8 THEN TRY_STRPTIME({digits_alias}, ['%Y%m%d', '%m%d%Y'])::DATE "
+            f"WHEN 6 THEN COALESCE({six_ymd}, {six_mdy}) END"
         )
-        eight_mdy_iso = _iso_from_parts_str(
-            f"SUBSTR({digits_alias}, 5, 4)", f"SUBSTR({digits_alias}, 1, 2)", f"SUBSTR({digits_alias}, 3, 2)"
-        )
-        eight_digit_expr = f"CASE WHEN {dlen_alias} = 8 THEN COALESCE(TRY_CAST({eight_ymd_iso} AS DATE), TRY_CAST({eight_mdy_iso} AS DATE)) END"
-
-        six_ymd_iso = _iso_from_parts_str(yyyy1_alias, f"SUBSTR({digits_alias}, 3, 2)", f"SUBSTR({digits_alias}, 5, 2)")
-        six_mdy_iso = _iso_from_parts_str(yyyy2_alias, f"SUBSTR({digits_alias}, 1, 2)", f"SUBSTR({digits_alias}, 3, 2)")
-        six_digit_expr = f"CASE WHEN {dlen_alias} = 6 THEN COALESCE(TRY_CAST({six_ymd_iso} AS DATE), TRY_CAST({six_mdy_iso} AS DATE)) END"
 
-        literal_try_expr = f"TRY_CAST(TRIM({column_alias}) AS DATE)"
+        # NULLIF: TRY_CAST('' AS DATE) goes through DuckDB's slow failed-cast path on blank cells
+        literal_try_expr = f"TRY_CAST(NULLIF(TRIM({column_alias}), '') AS DATE)"
 
-        value_expression = f"COALESCE({eight_digit_expr}, {six_digit_expr}, {literal_try_expr})"
+        value_expression = f"COALESCE({digits_expr}, {literal_try_expr})"
 
         return CasterPlan(partials=partials, value_expression=value_expression)
@@ -19,14 +19,22 @@ class DecimalCaster(CasterBase):
             raise ValueError("Only one of positive_suffix, negative_suffix, positive_prefix, or negative_prefix can be provided.")
         return self
 
-    def plan(self, column_alias: str) -> CasterPlan:
+    def _build_plan(self, column_alias: str) -> CasterPlan:
         # --- 1. Define aliases for intermediate and final expressions ---
         clean_alias = self.build_alias(column_alias, "clean")
         sign_alias = self.build_alias(column_alias, "sign")
         unsigned_str_alias = self.build_alias(column_alias, "unsigned_str")
 
         # --- 2. Define the base cleaning expression. This is the only expensive part. ---
-        clean_expression = f"UPPER(REPLACE(TRIM({column_alias}), ',', ''))"
+        #    Blank cells become NULL here: TRY_CAST('' AS DECIMAL) takes DuckDB's slow error path.
+        clean_expression = f"NULLIF(UPPER(REPLACE(TRIM({column_alias}), ',', '')), '')"
+
+        # No affixes (the common case): no sign or unsigned-string steps, just the cast
+        if not (self.positive_suffix or self.negative_suffix or self.positive_prefix or self.negative_prefix):
+            return CasterPlan(
+                partials=((clean_alias, clean_expression),),
+                value_expression=f"(TRY_CAST({clean_alias} AS DECIMAL))"
+            )
 
         # --- 3. Dynamically build the sign-handling logic ---
         #    This avoids generating `CASE WHEN FALSE THEN ...`
@@ -44,31 +52,28 @@ class DecimalCaster(CasterBase):
 
         # --- 4. Dynamically build the unsigned string logic ---
         #    This generates a clean CASE statement with only the necessary WHEN clauses.
+        #    A negative LEFT count drops that many trailing chars, so no per-row LENGTH is needed.
         when_clauses: list[str] = []
         if self.negative_suffix:
-            when_clauses.append(f"WHEN ENDS_WITH({clean_alias}, {sql_quote(self.negative_suffix.upper())}) THEN LEFT({clean_alias}, LENGTH({clean_alias}) - {len(self.negative_suffix)})")
+            when_clauses.append(f"WHEN ENDS_WITH({clean_alias}, {sql_quote(self.negative_suffix.upper())}) THEN LEFT({clean_alias}, -{len(self.negative_suffix)})")
         if self.positive_suffix:
-            when_clauses.append(f"WHEN ENDS_WITH({clean_alias}, {sql_quote(self.positive_suffix.upper())}) THEN LEFT({clean_alias}, LENGTH({clean_alias}) - {len(self.positive_suffix)})")
+            when_clauses.append(f"WHEN ENDS_WITH({clean_alias}, {sql_quote(self.positive_suffix.upper())}) THEN LEFT({clean_alias}, -{len(self.positive_suffix)})")
         if self.negative_prefix:
             when_clauses.append(f"WHEN STARTS_WITH({clean_alias}, {sql_quote(self.negative_prefix.upper())}) THEN SUBSTR({clean_alias}, {len(self.negative_prefix) + 1})")
         if self.positive_prefix:
             when_clauses.append(f"WHEN STARTS_WITH({clean_alias}, {sql_quote(self.positive_prefix.upper())}) THEN SUBSTR({clean_alias}, {len(self.positive_prefix) + 1})")
 
-        if when_clauses:
-            unsigned_str_expression = f"CASE {' '.join(when_clauses)} ELSE {clean_alias} END"
-        else:
-            # If no affixes are defined, the unsigned string is the same as the cleaned string.
-            unsigned_str_expression = clean_alias
-            
+        unsigned_str_expression = f"CASE {' '.join(when_clauses)} ELSE {clean_alias} END"
+
         # --- 5. The final value expression references the aliases from the `base` CTE ---
         value_expression = f"(TRY_CAST({unsigned_str_alias} AS DECIMAL) * {sign_alias})"
 
         return CasterPlan(
-            partials={
-                clean_alias: clean_expression,
-                sign_alias: sign_expression,
-                unsigned_str_alias: unsigned_str_expression,
-            },
+            partials=(
+                (clean_alias, clean_expression),
+                (sign_alias, sign_expression),
+                (unsigned_str_alias, unsigned_str_expression),
+            ),
             value_expression=value_expression
         )
 
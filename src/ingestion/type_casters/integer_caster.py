@@ -1,12 +1,13 @@
-from typing import Literal
+from typing import ClassVar, Literal
 from ingestion.type_casters.base_caster import CasterBase, CasterPlan
 
 
 class IntegerCaster(CasterBase):
     output_type: Literal["integer"]
+    INLINE_EXPRESSION_TEMPLATE: ClassVar[str | None] = "TRY_CAST(NULLIF(REPLACE(TRIM({col}), ',', ''), '') AS INTEGER)"
 
-    def plan(self, column_alias: str) -> CasterPlan:
+    def _build_plan(self, column_alias: str) -> CasterPlan:
         return CasterPlan(
-            partials={},
-            value_expression=f"TRY_CAST(REPLACE(TRIM({column_alias}), ',', '') AS INTEGER)"
+            partials=(),
+            value_expression=self.inline_sql(column_alias)
         )
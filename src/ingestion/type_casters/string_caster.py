@@ -1,13 +1,14 @@
-from typing import Literal
+from typing import ClassVar, Literal
 from ingestion.type_casters.base_caster import CasterBase, CasterPlan
 
 
 class StringCaster(CasterBase):
     output_type: Literal["string"]
+    INLINE_EXPRESSION_TEMPLATE: ClassVar[str | None] = "TRY_CAST({col} AS VARCHAR)"
 
-    def plan(self, column_alias: str) -> CasterPlan:
+    def _build_plan(self, column_alias: str) -> CasterPlan:
         return CasterPlan(
-            partials={},
-            value_expression=f"TRY_CAST({column_alias} AS VARCHAR)"
+            partials=(),
+            value_expression=self.inline_sql(column_alias)
         )
 
@@ -1,11 +1,14 @@
 import logging
 import cProfile
 import functools
-import io
+import heapq
+import os
 import json
 import hashlib
+
+import orjson
+import xxhash
 from pathlib import Path
-import pstats
 import re
 from typing import Any, Callable
 from datetime import datetime, timezone
@@ -17,79 +20,124 @@ logger = logging.getLogger(__name__)
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
+# Read once at import; profile_to_log is a pass-through unless this is set.
+_PROFILE_ENABLED = bool(os.getenv("INGEST_PROFILE"))
+
+
 def profile_to_log(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    if not _PROFILE_ENABLED:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # only start if another profile isn't already running (e.g. in nested calls)
-
-        if hasattr(wrapper, "_profiling_active") and wrapper._profiling_active:
+        # only start if another profile isn't already running (e.g. in nested calls),
+        # and skip it entirely when the stats would be dropped by the log level
+        if getattr(wrapper, "_profiling_active", False) or not logger.isEnabledFor(logging.DEBUG):
             return func(*args, **kwargs)
 
         pr = cProfile.Profile()
+        wrapper._profiling_active = True
         pr.enable()
-        
-        result = func(*args, **kwargs)
-        
-        pr.disable()
-        s = io.StringIO()
-        ps = pstats.Stats(pr, stream=s).sort_stats(pstats.SortKey.CUMULATIVE)
-        ps.print_stats(30)
-        
-        logger.debug(f"PROFILING [{func.__name__}]:\n{s.getvalue()}")
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            pr.disable()
+            wrapper._profiling_active = False
+
+        logger.debug(f"PROFILING [{func.__name__}]:\n{_format_top_cumulative(pr, 30)}")
         return result
     return wrapper
 
-def md5_record_hash(record: dict[str, Any]) -> str:
-    json_str = json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
-    return hashlib.md5(json_str.encode("utf-8")).hexdigest()
+
+def _format_top_cumulative(pr: cProfile.Profile, limit: int) -> str:
+    """Top `limit` functions by cumulative time; a partial sort instead of pstats' full sort + print."""
+    pr.create_stats()
+    # stats: (file, line, func) -> (primitive calls, total calls, tottime, cumtime, callers)
+    top = heapq.nlargest(limit, pr.stats.items(), key=lambda item: item[1][3])
+    lines = ["   ncalls  tottime  cumtime  filename:lineno(function)"]
+    for (filename, lineno, funcname), (prim_calls, calls, tottime, cumtime, _) in top:
+        ncalls = str(calls) if calls == prim_calls else f"{calls}/{prim_calls}"
+        lines.append(f"{ncalls:>9} {tottime:8.3f} {cumtime:8.3f}  {filename}:{lineno}({funcname})")
+    return "\n".join(lines)
+
+_RECORD_HASH_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def record_hash(record: dict[str, Any]) -> str:
+    """
+    32-hex-char xxh3-128 digest of a record's canonical (sorted-key) orjson bytes.
+
+    Not MD5: these values don't match hashes produced by the former md5_record_hash.
+    """
+    return xxhash.xxh3_128_hexdigest(orjson.dumps(record, default=str, option=_RECORD_HASH_OPTS))
 
 
 def sha256_file_hash(file_path: Path) -> str:
-    hash_sha256 = hashlib.sha256()
+    # file_digest reads and hashes in C with the GIL released
     with file_path.open("rb") as f:
-        for chunk in iter(lambda: f.read(131072), b""):
-            hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 def calculate_spec_hash(spec: CSVIngestSpec) -> str:
     """
     Hashes the dictionary representation of the config.
     Effectively: MD5(YAML Content - Comments - Whitespace)
     """
-    # 1. Get the raw dictionary. 
-    # 'exclude_defaults=True' strips out date.today() and anything else 
+    # 'exclude_defaults=True' strips out date.today() and anything else
     # that wasn't explicitly written in your YAML file.
-    data = spec.model_dump(exclude_defaults=True, mode='json')
-
-    # 2. Dump to JSON with sorting.
-    # We use a custom encoder to handle 'sets' if they exist in your config.
-    json_str = json.dumps(
-        data, 
-        sort_keys=True,             # Sort dictionary keys (a:1, b:2)
-        default=deterministic_serializer # Handle sets/dates
-    )
-    
+    # model_dump_json serialises in pydantic-core and doubles as the cache key,
+    # so repeat calls for the same spec content skip the Python-side dump + hash.
+    return _spec_hash_from_json(spec.model_dump_json(exclude_defaults=True))
+
+
+@functools.lru_cache(maxsize=256)
+def _spec_hash_from_json(spec_json: str) -> str:
+    # orjson parses in C and yields plain JSON types only, so no set/date
+    # fallback is needed. The re-encode stays on json.dumps: its spacing and
+    # ASCII escaping are what existing spec hashes were computed over.
+    json_str = json.dumps(orjson.loads(spec_json), sort_keys=True)
+
     return hashlib.md5(json_str.encode("utf-8")).hexdigest()
 
-def deterministic_serializer(obj: Any) -> Any:
-    """
-    Helper to serialize types that JSON doesn't handle natively,
-    ensuring they are sorted deterministically.
-    """
-    if isinstance(obj, (set, frozenset)):
-        # Convert set to list and sort it
-        return sorted(list(obj), key=str)
-    # Fallback for dates/other types (though mode='json' above handles most)
-    return str(obj)
+
+def _century_for_short_year(yy: int) -> int:
+    # Same pivot as strptime's %y: 69-99 -> 1900s, 00-68 -> 2000s
+    return 1900 if yy >= 69 else 2000
+
+
+# Fixed-width digit formats parsed by slicing. Values that don't match the expected
+# shape exactly (and any other format) fall through to datetime.strptime.
+_FAST_DATE_PARSERS: dict[str, tuple[re.Pattern[str], Callable[[str], datetime]]] = {
+    "%Y%m%d": (re.compile(r"\d{8}", re.ASCII), lambda s: datetime(int(s[:4]), int(s[4:6]), int(s[6:8]))),
+    "%y%m%d": (re.compile(r"\d{6}", re.ASCII), lambda s: datetime(_century_for_short_year(int(s[:2])) + int(s[:2]), int(s[2:4]), int(s[4:6]))),
+    "%Y-%m-%d": (re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII), lambda s: datetime(int(s[:4]), int(s[5:7]), int(s[8:10]))),
+}
 
 
-def parse_data_snapshot_date_from_filename(filename: str, filename_date_regex: str, filename_date_format: str) -> datetime | None:
+def _parse_filename_date(value: str, fmt: str) -> datetime:
+    fast = _FAST_DATE_PARSERS.get(fmt)
+    if fast is not None and fast[0].fullmatch(value):
+        return fast[1](value)
+    return datetime.strptime(value, fmt)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_filename_date_regex(filename_date_regex: str) -> re.Pattern[str]:
+    return re.compile(filename_date_regex)
+
+
+def parse_data_snapshot_date_from_filename(
+    filename: str, filename_date_regex: str | re.Pattern[str] | None, filename_date_format: str | None
+) -> datetime | None:
+    """Accepts the regex as a string or pre-compiled (e.g. `SourceSpec.filename_date_pattern`)."""
     if not filename_date_regex or not filename_date_format:
         return None
-    
-    match = re.search(filename_date_regex, filename)
+
+    if isinstance(filename_date_regex, str):
+        filename_date_regex = _compile_filename_date_regex(filename_date_regex)
+
+    match = filename_date_regex.search(filename)
     if not match:
-        logger.warning(f"Filename '{filename}' does not match the provided regex '{filename_date_regex}'. Cannot parse data snapshot date.")
+        logger.warning(f"Filename '{filename}' does not match the provided regex '{filename_date_regex.pattern}'. Cannot parse data snapshot date.")
         return None
     
-    return datetime.strptime(match.group(1), filename_date_format)
+    return _parse_filename_date(match.group(1), filename_date_format)
@@ -14,12 +14,15 @@ from core.settings import (
     STATE_DB_PATH, 
     PACKAGE_CACHE_DIR, 
     SYSTEM_COL_DATA_AS_OF_DATE,
-    SYSTEM_COL_SOURCE_FILE
+    SYSTEM_COL_SOURCE_FILE,
+    ensure_directories,
 )
 
 
 SYSTEM_START_DATE = "2026-02-17"
 
+ensure_directories()
+
 
 config = Config(
     default_gateway="default",
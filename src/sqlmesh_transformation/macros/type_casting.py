@@ -1,7 +1,33 @@
+import functools
+
+import sqlglot
+from sqlglot import exp
 from sqlmesh import macro, SQL
 from sqlmesh.core.macros import MacroEvaluator
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_macro_sql(sql: str, dialect: str) -> exp.Expression:
+    return sqlglot.parse_one(sql, dialect=dialect)
+
+
+def _to_expression(evaluator: MacroEvaluator, sql: str) -> exp.Expression:
+    """
+    Hands SQLMesh a parsed node instead of text, so it doesn't re-parse the macro output.
+    Each distinct output is parsed once; callers get a copy because SQLMesh edits the tree in place.
+    """
+    return _parse_macro_sql(sql, evaluator.dialect).copy()
+
+
+# on_null -> builder(field_name, null_default) for the SQL used when the input is NULL
+_NULL_BRANCH_BUILDERS = {
+    "preserve": lambda field_name, null_default: "NULL",
+    "default": lambda field_name, null_default: null_default,
+    "error": lambda field_name, null_default: f"error('{field_name} cannot be NULL')",
+}
+
+
+@functools.lru_cache(maxsize=4096)
 def _apply_null_policy(
     value_sql: str,
     expr_sql: str,
@@ -9,25 +35,45 @@ def _apply_null_policy(
     on_null: str,
     null_default: str | None,
     field_name: str,
+    expr_null_propagates: bool = False,
 ) -> str:
-    if on_null not in ("preserve", "default", "error"):
-        raise ValueError('on_null must be one of: "preserve", "default", "error"')
+    try:
+        build_null_branch = _NULL_BRANCH_BUILDERS[on_null]
+    except KeyError:
+        raise ValueError('on_null must be one of: "preserve", "default", "error"') from None
     if on_null == "default" and null_default is None:
         raise ValueError('null_default must be provided when on_null="default"')
 
-    if on_null == "preserve":
-        null_branch = "NULL"
-    elif on_null == "default":
-        null_branch = null_default
-    else:  # "error"
-        null_branch = f"error('{field_name} cannot be NULL')"
-
-    return f"""
-        CASE
-            WHEN {value_sql} IS NULL THEN {null_branch}
-            ELSE {expr_sql}
-        END
-    """
+    # expr_null_propagates: expr is NULL exactly when value_sql is (no error() ELSE firing on NULL,
+    # no NULL for a non-NULL input), so the policy needs no separate per-row IS NULL test.
+    if expr_null_propagates:
+        if on_null == "preserve":
+            return expr_sql
+        if on_null == "default":
+            return f"COALESCE({expr_sql}, {null_default})"
+
+    null_branch = build_null_branch(field_name, null_default)
+
+    return f"CASE WHEN {value_sql} IS NULL THEN {null_branch} ELSE {expr_sql} END"
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_account_number_sql(
+    value: SQL,
+    *,
+    on_null: str,
+    null_default: str | None,
+) -> str:
+    cleaned = f"UPPER(TRIM(REPLACE({value}, '-', '')))"
+    expr = f"CAST(NULLIF({cleaned}, '') AS VARCHAR)"
+    return _apply_null_policy(
+        f"NULLIF(TRIM(REPLACE({value}, '-', '')), '')",
+        expr, 
+        on_null=on_null, 
+        null_default=null_default, 
+        field_name="Account number",
+        expr_null_propagates=True,
+    )
 
 
 @macro()
@@ -37,7 +83,7 @@ def clean_account_number(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Cleans an account number by removing dashes, trimming whitespace, and converting to uppercase. The cleaned value is cast to VARCHAR.
      Invalid (non-null) values will not error in this function since we are just applying string transformations, 
@@ -49,15 +95,19 @@ def clean_account_number(
             - "default": NULL inputs result in `null_default` output (must be provided if on_null="default")
             - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
-    cleaned = f"UPPER(TRIM(REPLACE({value}, '-', '')))"
-    expr = f"CAST(NULLIF({cleaned}, '') AS VARCHAR)"
-    return _apply_null_policy(
-        f"NULLIF(TRIM(REPLACE({value}, '-', '')), '')",
-        expr, 
-        on_null=on_null, 
-        null_default=null_default, 
-        field_name="Account number"
-    )
+    return _to_expression(evaluator, _clean_account_number_sql(value, on_null=on_null, null_default=null_default))
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_cusip_sql(
+    value: SQL,
+    *,
+    on_null: str,
+    null_default: str | None,
+) -> str:
+    expr = f"CAST(UPPER(TRIM({value})) AS VARCHAR)"
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="CUSIP", expr_null_propagates=True)
+
 
 @macro()
 def clean_cusip(
@@ -66,7 +116,7 @@ def clean_cusip(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Cleans a CUSIP by trimming whitespace and converting to uppercase. The cleaned value is cast to VARCHAR.
      Invalid (non-null) values will not error in this function since we are just applying string transformations, 
@@ -78,8 +128,32 @@ def clean_cusip(
             - "default": NULL inputs result in `null_default` output (must be provided if on_null="default")
             - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
-    expr = f"CAST(UPPER(TRIM({value})) AS VARCHAR)"
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="CUSIP")
+    return _to_expression(evaluator, _clean_cusip_sql(value, on_null=on_null, null_default=null_default))
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_currency_code_sql(
+    value: SQL,
+    *,
+    on_null: str,
+    null_default: str | None,
+) -> str:
+
+    # TODO: Figure out what currency code "F", "E", "D", "Y" and "A" are
+    # Simple CASE: the normalized value is written (and evaluated) once, not per branch
+    expr = (
+        f"CASE UPPER(TRIM({value}))"
+        " WHEN 'F' THEN 'UNKNOWN'"
+        " WHEN 'D' THEN 'UNKNOWN'"
+        " WHEN 'Y' THEN 'JPY'"
+        " WHEN 'A' THEN 'AUD'"
+        " WHEN 'E' THEN 'EUR'"
+        " WHEN 'C' THEN 'CAD'"
+        " WHEN 'U' THEN 'USD'"
+        f" ELSE error('Unrecognized currency code: ' || {value}) END"
+    )
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Currency code")
+
 
 @macro()
 def clean_currency_code(
@@ -88,22 +162,27 @@ def clean_currency_code(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
+) -> exp.Expression:
+    return _to_expression(evaluator, _clean_currency_code_sql(value, on_null=on_null, null_default=null_default))
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_status_sql(
+    value: SQL,
+    *,
+    on_null: str,
+    null_default: str | None,
 ) -> str:
+    expr = (
+        f"CASE UPPER(TRIM({value}))"
+        " WHEN 'A' THEN 'ACTIVE'"
+        " WHEN 'C' THEN 'CLOSED'"
+        " WHEN 'P' THEN 'PROSPECTIVE'"
+        " WHEN 'D' THEN 'DELETED'"
+        f" ELSE error('Unrecognized status value: ' || {value}) END"
+    )
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Status")
 
-    # TODO: Figure out what currency code "F", "E", "D", "Y" and "A" are
-    expr = f"""
-        CASE
-            WHEN UPPER(TRIM({value})) = 'F' THEN 'UNKNOWN'
-            WHEN UPPER(TRIM({value})) = 'D' THEN 'UNKNOWN'
-            WHEN UPPER(TRIM({value})) = 'Y' THEN 'JPY'
-            WHEN UPPER(TRIM({value})) = 'A' THEN 'AUD'
-            WHEN UPPER(TRIM({value})) = 'E' THEN 'EUR'
-            WHEN UPPER(TRIM({value})) = 'C' THEN 'CAD'
-            WHEN UPPER(TRIM({value})) = 'U' THEN 'USD'
-            ELSE error('Unrecognized currency code: ' || {value})
-        END
-    """
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Currency code")
 
 @macro()
 def clean_status(
@@ -112,18 +191,24 @@ def clean_status(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
+) -> exp.Expression:
+    return _to_expression(evaluator, _clean_status_sql(value, on_null=on_null, null_default=null_default))
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_part_sql(
+    value: SQL, 
+    delimiter: str, 
+    part_index: int,
+    null_policy: str,
+    null_default: str | None,
 ) -> str:
-    expr = f"""
-        CASE
-            WHEN UPPER(TRIM({value})) = 'A' THEN 'ACTIVE'
-            WHEN UPPER(TRIM({value})) = 'C' THEN 'CLOSED'
-            WHEN UPPER(TRIM({value})) = 'P' THEN 'PROSPECTIVE'
-            WHEN UPPER(TRIM({value})) = 'D' THEN 'DELETED'
-
-            ELSE error('Unrecognized status value: ' || {value})
-        END
-    """
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Status")
+    expr = (
+        f"CASE WHEN STRPOS({value}, '{delimiter}') = 0 THEN ERROR('Delimiter \"{delimiter}\" not found in value: ' || {value})"
+        f" ELSE TRIM(SPLIT_PART({value}, '{delimiter}', {part_index})) END"
+    )
+    return _apply_null_policy(value, expr, on_null=null_policy, null_default=null_default, field_name=f"Part {part_index} of {value}")
+
 
 @macro()
 def split_part(
@@ -133,7 +218,7 @@ def split_part(
     part_index: int,
     null_policy: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Splits a string by a delimiter and returns the specified part (1-based index). The input is normalized by trimming whitespace.
     If the delimiter is not found in the value, an error is raised with a message indicating the missing delimiter and the original value. 
@@ -145,13 +230,65 @@ def split_part(
         - "default": NULL inputs result in `null_default` output (must be provided if null_policy="default")
         - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
-    expr = f"""
-        CASE 
-            WHEN STRPOS({value}, '{delimiter}') = 0 THEN ERROR('Delimiter "{delimiter}" not found in value: ' || {value})
-            ELSE TRIM(SPLIT_PART({value}, '{delimiter}', {part_index}))
-        END
-    """
-    return _apply_null_policy(value, expr, on_null=null_policy, null_default=null_default, field_name=f"Part {part_index} of {value}")
+    return _to_expression(evaluator, _split_part_sql(value, delimiter, part_index, null_policy, null_default))
+
+
+@functools.lru_cache(maxsize=4096)
+def _cast_to_numeric_sql(
+    value: SQL,
+    positive_prefix: str | None,
+    positive_suffix: str | None,
+    negative_prefix: str | None,
+    negative_suffix: str | None,
+    *,
+    on_null: str,
+    null_default: str | None,
+) -> str:
+
+    affix_count = (
+        (positive_prefix is not None) + (positive_suffix is not None)
+        + (negative_prefix is not None) + (negative_suffix is not None)
+    )
+    cleaned_value = f"TRIM(REPLACE({value}, ',', ''))"
+
+    # No affixes is the common case: plain cast, skip the sign ladder below
+    if affix_count == 0:
+        expr = f"CAST({cleaned_value} AS NUMERIC)"
+        return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Numeric value", expr_null_propagates=True)
+
+    if affix_count > 1:
+        raise ValueError(
+            "Only one of positive_prefix, positive_suffix, negative_prefix, negative_suffix can be provided."
+        )
+
+    # Invalid non-null inputs should error via CAST failure (no fallback).
+    # Suffixes are cut with a negative LEFT count, so the cleaned value isn't re-evaluated for LENGTH.
+    if positive_prefix is not None:
+        expr = (
+            f"CASE WHEN {cleaned_value} LIKE '{positive_prefix}%'"
+            f" THEN CAST(SUBSTRING({cleaned_value}, {len(positive_prefix) + 1}) AS NUMERIC)"
+            f" ELSE CAST({cleaned_value} AS NUMERIC) * -1 END"
+        )
+    elif positive_suffix is not None:
+        expr = (
+            f"CASE WHEN {cleaned_value} LIKE '%{positive_suffix}'"
+            f" THEN CAST(LEFT({cleaned_value}, -{len(positive_suffix)}) AS NUMERIC)"
+            f" ELSE CAST({cleaned_value} AS NUMERIC) * -1 END"
+        )
+    elif negative_prefix is not None:
+        expr = (
+            f"CASE WHEN {cleaned_value} LIKE '{negative_prefix}%'"
+            f" THEN CAST(SUBSTRING({cleaned_value}, {len(negative_prefix) + 1}) AS NUMERIC) * -1"
+            f" ELSE CAST({cleaned_value} AS NUMERIC) END"
+        )
+    else:  # negative_suffix
+        expr = (
+            f"CASE WHEN {cleaned_value} LIKE '%{negative_suffix}'"
+            f" THEN CAST(LEFT({cleaned_value}, -{len(negative_suffix)}) AS NUMERIC) * -1"
+            f" ELSE CAST({cleaned_value} AS NUMERIC) END"
+        )
+
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Numeric value")
 
 
 @macro()
@@ -165,7 +302,7 @@ def cast_to_numeric(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Cleans and casts a value to numeric. The input is normalized by trimming whitespace and removing commas.
     The sign of the number can be determined by optional prefixes/suffixes. For example, if positive_prefix is '$' and negative_suffix is 'CR', then:
@@ -180,51 +317,29 @@ def cast_to_numeric(
         - "default": NULL inputs result in `null_default` output (must be provided if on_null="default")
         - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
+    return _to_expression(evaluator, _cast_to_numeric_sql(value, positive_prefix, positive_suffix, negative_prefix, negative_suffix, on_null=on_null, null_default=null_default))
 
-    if sum(x is not None for x in [positive_prefix, positive_suffix, negative_prefix, negative_suffix]) > 1:
-        raise ValueError(
-            "Only one of positive_prefix, positive_suffix, negative_prefix, negative_suffix can be provided."
-        )
 
-    cleaned_value = f"TRIM(REPLACE({value}, ',', ''))"
+@functools.lru_cache(maxsize=4096)
+def _cast_to_date_sql(
+    value: SQL,
+    format: str,
+    prefer_past: bool,
+    future_year_threshold: int,
+    *,
+    on_null: str,
+    null_default: str | None,
+) -> str:
+    parsed_date = f"CAST(STRPTIME(TRIM({value}), '{format}') AS DATE)"
+    boundary_date = f"CAST(CURRENT_DATE + INTERVAL '{future_year_threshold} years' AS DATE)"
+    adjusted_date = f"CAST({parsed_date} - INTERVAL '100 years' AS DATE)"
 
-    # Invalid non-null inputs should error via CAST failure (no fallback).
-    if positive_prefix is not None:
-        expr = f"""
-            CASE
-                WHEN {cleaned_value} LIKE '{positive_prefix}%'
-                THEN CAST(SUBSTRING({cleaned_value}, {len(positive_prefix) + 1}) AS NUMERIC)
-                ELSE CAST({cleaned_value} AS NUMERIC) * -1
-            END
-        """
-    elif positive_suffix is not None:
-        expr = f"""
-            CASE
-                WHEN {cleaned_value} LIKE '%{positive_suffix}'
-                THEN CAST(SUBSTRING({cleaned_value}, 1, LENGTH({cleaned_value}) - {len(positive_suffix)}) AS NUMERIC)
-                ELSE CAST({cleaned_value} AS NUMERIC) * -1
-            END
-        """
-    elif negative_prefix is not None:
-        expr = f"""
-            CASE
-                WHEN {cleaned_value} LIKE '{negative_prefix}%'
-                THEN CAST(SUBSTRING({cleaned_value}, {len(negative_prefix) + 1}) AS NUMERIC) * -1
-                ELSE CAST({cleaned_value} AS NUMERIC)
-            END
-        """
-    elif negative_suffix is not None:
-        expr = f"""
-            CASE
-                WHEN {cleaned_value} LIKE '%{negative_suffix}'
-                THEN CAST(SUBSTRING({cleaned_value}, 1, LENGTH({cleaned_value}) - {len(negative_suffix)}) AS NUMERIC) * -1
-                ELSE CAST({cleaned_value} AS NUMERIC)
-            END
-        """
+    if not prefer_past:
+        expr = parsed_date
     else:
-        expr = f"CAST({cleaned_value} AS NUMERIC)"
+        expr = f"CASE WHEN {parsed_date} > {boundary_date} THEN {adjusted_date} ELSE {parsed_date} END"
 
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Numeric value")
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Date value", expr_null_propagates=not prefer_past)
 
 
 @macro()
@@ -237,7 +352,7 @@ def cast_to_date(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Parses a date from a string using the provided format. The input is normalized by trimming whitespace.
     The `format` should be in the syntax expected by the underlying SQL engine's STRPTIME function (e.g. '%Y-%m-%d' for '2024-01-01').
@@ -257,21 +372,29 @@ def cast_to_date(
         - "default": NULL inputs result in `null_default` output (must be provided if on_null="default")
         - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
-    parsed_date = f"CAST(STRPTIME(TRIM({value}), '{format}') AS DATE)"
-    boundary_date = f"CAST(CURRENT_DATE + INTERVAL '{future_year_threshold} years' AS DATE)"
-    adjusted_date = f"CAST({parsed_date} - INTERVAL '100 years' AS DATE)"
+    return _to_expression(evaluator, _cast_to_date_sql(value, format, prefer_past, future_year_threshold, on_null=on_null, null_default=null_default))
 
-    if not prefer_past:
-        expr = parsed_date
-    else:
-        expr = f"""
-            CASE
-                WHEN {parsed_date} > {boundary_date} THEN {adjusted_date}
-                ELSE {parsed_date}
-            END
-        """
 
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Date value")
+@functools.lru_cache(maxsize=4096)
+def _cast_to_boolean_sql(
+    value: SQL,
+    *,
+    true_tokens: tuple[str, ...],
+    false_tokens: tuple[str, ...],
+    on_null: str,
+    null_default: str | None,
+) -> str:
+    norm = f"UPPER(TRIM(CAST({value} AS VARCHAR)))"
+
+    # One WHEN per token under a simple CASE, so `norm` is evaluated once per row
+    when_clauses = " ".join(
+        [f"WHEN '{t.upper()}' THEN TRUE" for t in true_tokens]
+        + [f"WHEN '{t.upper()}' THEN FALSE" for t in false_tokens]
+    )
+
+    expr = f"CASE {norm} {when_clauses} ELSE error('Unrecognized boolean token: ' || {value}) END"
+
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Boolean value")
 
 
 @macro()
@@ -283,7 +406,7 @@ def cast_to_boolean(
     false_tokens: tuple[str, ...] = ("F", "FALSE", "N", "NO"),
     on_null: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Converts a string to a boolean based on specified true/false/null tokens.
     The input is normalized by trimming whitespace, converting to uppercase, and casting to VARCHAR.
@@ -295,25 +418,19 @@ def cast_to_boolean(
     - "default": NULL inputs result in `null_default` output (must be provided if on_null="default")
     - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
-    norm = f"UPPER(TRIM(CAST({value} AS VARCHAR)))"
+    return _to_expression(evaluator, _cast_to_boolean_sql(value, true_tokens=tuple(true_tokens), false_tokens=tuple(false_tokens), on_null=on_null, null_default=null_default))
 
-    true_list = ", ".join(f"'{t.upper()}'" for t in true_tokens)
-    false_list = ", ".join(f"'{t.upper()}'" for t in false_tokens)
 
-    if on_null not in ("preserve", "default", "error"):
-        raise ValueError('on_null must be one of: "preserve", "default", "error"')
-    if on_null == "default" and null_default is None:
-        raise ValueError('null_default must be provided when on_null="default"')
-
-    expr = f"""
-        CASE
-            WHEN {norm} IN ({true_list}) THEN TRUE
-            WHEN {norm} IN ({false_list}) THEN FALSE
-            ELSE error('Unrecognized boolean token: ' || {value})
-        END
-    """
-
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Boolean value")
+@functools.lru_cache(maxsize=4096)
+def _cast_to_integer_sql(
+    value: SQL,
+    *,
+    on_null: str,
+    null_default: str | None,
+) -> str:
+    cleaned_value = f"TRIM(REPLACE({value}, ',', ''))"
+    expr = f"CAST({cleaned_value} AS INTEGER)"  # invalid inputs error via CAST
+    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Integer value", expr_null_propagates=True)
 
 
 @macro()
@@ -323,7 +440,7 @@ def cast_to_integer(
     *,
     on_null: str = "preserve",
     null_default: str | None = None,
-) -> str:
+) -> exp.Expression:
     """
     Cleans and casts a value to integer. The input is normalized by trimming whitespace and removing commas.
     Invalid (non-null, non-integer) values will error via the CAST. 
@@ -334,6 +451,4 @@ def cast_to_integer(
     - "default": NULL inputs result in `null_default` output (must be provided if on_null="default")
     - "error": NULL inputs result in an error with a message indicating the field name that cannot be NULL.
     """
-    cleaned_value = f"TRIM(REPLACE({value}, ',', ''))"
-    expr = f"CAST({cleaned_value} AS INTEGER)"  # invalid inputs error via CAST
-    return _apply_null_policy(value, expr, on_null=on_null, null_default=null_default, field_name="Integer value")
+    return _to_expression(evaluator, _cast_to_integer_sql(value, on_null=on_null, null_default=null_default))